@@ -0,0 +1,352 @@
+import asyncio
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import msgpack
+from pydantic import BaseModel
+
+from .config import settings
+from ..schemas.fund import FundSummary, FundDetail, NavDataPoint
+
+# Models that can be stored in a shared cache backend
+_CACHEABLE_MODELS = {
+    "FundSummary": FundSummary,
+    "FundDetail": FundDetail,
+}
+
+class CacheBackend(ABC):
+    """Interface for the cache backends used by the services and the LLM client."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds, defaults to settings.cache_ttl;
+                zero or less expires the value immediately
+        """
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Store a value only if the key has no live value, atomically.
+
+        Used as a lock shared between workers.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds, defaults to settings.cache_ttl
+
+        Returns:
+            True if the value was stored
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Remove a value from the cache.
+
+        Args:
+            key: Cache key
+        """
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process cache holding values as-is in a dict.
+
+    With max_entries set, the least recently written entries are dropped
+    beyond that number.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            self._store.pop(key, None)
+            return None
+
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._store[key] = (time.time() + _resolve_ttl(ttl), value)
+        self._store.move_to_end(key)
+
+        if self.max_entries is not None:
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    async def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
+class SharedDiskCacheBackend(CacheBackend):
+    """
+    Cache shared between worker processes through files in a directory.
+
+    Point the directory at a tmpfs such as /dev/shm to keep it in shared
+    memory. Every entry is a file holding its expiry time followed by the
+    serialized value; writes go through a uniquely named temporary file and an
+    atomic rename so readers never see a partial entry.
+
+    At most every settings.disk_cache_sweep_interval seconds a write also
+    sweeps the directory: expired entries are removed, then the oldest ones
+    beyond max_entries.
+
+    add() holds an exclusive flock on a lock file in the directory, so only
+    one worker at a time checks and takes over a key.
+    """
+
+    _HEADER = struct.Struct("!d")
+    _TMP_SUFFIX = ".tmp"
+    _ADD_LOCK = ".add.lock"
+
+    def __init__(self, directory: str, max_entries: Optional[int] = None):
+        self.directory = directory
+        self.max_entries = settings.disk_cache_max_entries if max_entries is None else max_entries
+        self._last_sweep = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + _resolve_ttl(ttl)
+        await asyncio.to_thread(self._write, key, self._HEADER.pack(expires_at) + dumps(value))
+
+        if time.time() - self._last_sweep >= settings.disk_cache_sweep_interval:
+            self._last_sweep = time.time()
+            await asyncio.to_thread(self.sweep)
+
+    async def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        expires_at = time.time() + _resolve_ttl(ttl)
+        return await asyncio.to_thread(self._add, key, self._HEADER.pack(expires_at) + dumps(value))
+
+    async def delete(self, key: str) -> None:
+        _remove(self._path(key))
+
+    def sweep(self) -> None:
+        """Remove expired entries and the oldest entries beyond max_entries."""
+        now = time.time()
+        entries = []
+
+        for entry in os.scandir(self.directory):
+            if entry.name == self._ADD_LOCK:
+                continue
+            try:
+                if entry.name.endswith(self._TMP_SUFFIX):
+                    # Leftover of a writer that died before renaming
+                    if now - entry.stat().st_mtime > 60:
+                        _remove(entry.path)
+                    continue
+
+                with open(entry.path, "rb") as f:
+                    header = f.read(self._HEADER.size)
+                (expires_at,) = self._HEADER.unpack(header)
+                mtime = entry.stat().st_mtime
+            except (FileNotFoundError, struct.error):
+                continue
+
+            if expires_at <= now:
+                _remove(entry.path)
+            else:
+                entries.append((mtime, entry.path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                _remove(path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def _read(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+
+        (expires_at,) = self._HEADER.unpack_from(payload)
+        if expires_at <= time.time():
+            _remove(path)
+            return None
+
+        return loads(payload[self._HEADER.size:])
+
+    def _write(self, key: str, payload: bytes) -> None:
+        tmp_path = self._write_temp(payload)
+        try:
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+    def _add(self, key: str, payload: bytes) -> bool:
+        # Checking and replacing an expired entry must not interleave with
+        # another worker doing the same, or both would take the key
+        with open(os.path.join(self.directory, self._ADD_LOCK), "ab") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._read(key) is not None:
+                return False
+            self._write(key, payload)
+            return True
+
+    def _write_temp(self, payload: bytes) -> str:
+        """Write a payload to a new uniquely named temporary file in the directory."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=self._TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+        return tmp_path
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared between worker processes and hosts through a Redis-compatible server."""
+
+    def __init__(self, url: str, namespace: str = ""):
+        # Imported here so redis is only required when this backend is used
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = f"{namespace}:" if namespace else ""
+
+    async def get(self, key: str) -> Optional[Any]:
+        payload = await self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        return loads(payload)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = _resolve_ttl(ttl)
+        # Redis rejects non-positive expiry times
+        if ttl <= 0:
+            await self.delete(key)
+            return
+        await self.client.set(self.prefix + key, dumps(value), ex=ttl)
+
+    async def add(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        ttl = _resolve_ttl(ttl)
+        if ttl <= 0:
+            return True
+        return bool(await self.client.set(self.prefix + key, dumps(value), ex=ttl, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+def create_cache_backend(namespace: str, max_entries: Optional[int] = None) -> CacheBackend:
+    """
+    Create the cache backend configured in settings.
+
+    Args:
+        namespace: Name separating this cache from others on the same backend
+        max_entries: Entry cap for the memory and disk backends; the disk
+            backend defaults to settings.disk_cache_max_entries
+
+    Returns:
+        CacheBackend: Configured cache backend
+    """
+    if settings.cache_backend == "redis":
+        return RedisCacheBackend(settings.redis_url, namespace=namespace)
+    if settings.cache_backend == "disk":
+        return SharedDiskCacheBackend(os.path.join(settings.cache_dir, namespace), max_entries=max_entries)
+    return InMemoryCacheBackend(max_entries=max_entries)
+
+def _resolve_ttl(ttl: Optional[int]) -> int:
+    """Use the default TTL only when none was given, so ttl=0 still expires immediately."""
+    return settings.cache_ttl if ttl is None else ttl
+
+def _remove(path: str) -> None:
+    """Remove a file that another worker may have removed already."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# Serialization helpers
+
+def dumps(value: Any) -> bytes:
+    """Serialize a cache value to msgpack."""
+    return msgpack.packb(_encode(value), use_bin_type=True)
+
+def loads(payload: bytes) -> Any:
+    """Deserialize a cache value from msgpack."""
+    return _decode(msgpack.unpackb(payload, raw=False))
+
+def _encode(value: Any) -> Any:
+    """Convert models to plain msgpack types, tagging them with their model name."""
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+
+    if isinstance(value, BaseModel):
+        data = value.dict()
+
+        # Store NAV history as a date list and a packed float array
+        if isinstance(value, FundDetail) and value.nav_data is not None:
+            data["nav_data"] = {
+                "dates": [point.date for point in value.nav_data],
+                "navs": array("d", (point.nav for point in value.nav_data)).tobytes()
+            }
+
+        return {"__model__": type(value).__name__, "data": data}
+
+    return value
+
+def _decode(value: Any) -> Any:
+    """Rebuild models from values produced by _encode."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+
+    if isinstance(value, dict) and "__model__" in value:
+        data = value["data"]
+
+        nav_data = data.get("nav_data")
+        if isinstance(nav_data, dict):
+            navs = array("d")
+            navs.frombytes(nav_data["navs"])
+            data["nav_data"] = [
+                NavDataPoint(date=date, nav=nav)
+                for date, nav in zip(nav_data["dates"], navs)
+            ]
+
+        return _CACHEABLE_MODELS[value["__model__"]](**data)
+
+    return value
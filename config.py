@@ -1,4 +1,9 @@
-from pydantic import BaseSettings, Field
+from pydantic import Field
+try:
+    # pydantic 2 moved BaseSettings into pydantic-settings
+    from pydantic_settings import BaseSettings
+except ImportError:
+    from pydantic import BaseSettings
 from typing import Optional
 import os
 from dotenv import load_dotenv
@@ -23,6 +28,44 @@ class Settings(BaseSettings):
     # Cache Settings
     enable_cache: bool = True
     cache_ttl: int = 3600  # 1 hour
+    catalog_cache_ttl: int = 86400  # 1 day
+    llm_cache_ttl: int = 86400  # 1 day
+    enable_llm_cache: bool = True
+    
+    # Cache backend: "memory" (per process), "disk" (shared between workers
+    # through cache_dir) or "redis" (shared through redis_url)
+    cache_backend: str = Field(default=os.getenv("CACHE_BACKEND", "memory"))
+    cache_dir: str = Field(default=os.getenv("CACHE_DIR", "/dev/shm/fund-search-cache"))
+    redis_url: str = Field(default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    disk_cache_max_entries: int = 10000  # per namespace
+    disk_cache_sweep_interval: int = 300  # 5 minutes
+    # Entry caps for the memory and disk backends of the service and LLM caches
+    mfapi_cache_max_entries: int = 5000
+    llm_cache_max_entries: int = 2000
+    
+    # Responses larger than this many bytes are compressed
+    compression_minimum_size: int = 500
+    
+    # Hot Fund Refresh
+    enable_hot_fund_refresh: bool = True
+    hot_fund_refresh_interval: int = 2700  # 45 minutes, shorter than cache_ttl
+    hot_fund_limit: int = 50
+    hot_fund_min_requests: int = 3
+    refresh_concurrency: int = 4
+    refresh_jitter: float = 30.0  # seconds
+    nav_publish_hour: int = 23  # IST, after AMFI publishes the day's NAVs
+    nav_publish_minute: int = 30
+    
+    # Portfolio Simulation
+    max_simulation_funds: int = 10
+    max_simulation_scenarios: int = 500
+    
+    # Conversation Sessions
+    session_ttl: int = 1800  # 30 minutes
+    max_sessions: int = 1000
+    session_max_turns: int = 5
+    session_max_funds: int = 5
+    session_summary_chars: int = 500
     
     class Config:
         env_file = ".env"
@@ -1,18 +1,33 @@
-from typing import Dict, List, Any, Tuple, AsyncIterator
+from typing import Dict, List, Any, Tuple, AsyncIterator, Optional
 from langgraph.graph import StateGraph, END
 from langchain.schema import AIMessage
 from .nodes import (
     analyze_query,
     search_funds,
     fetch_fund_details,
+    fetch_latest_nav,
+    simulate_portfolio,
+    reuse_session_context,
     analyze_funds,
-    generate_final_response
+    generate_final_response,
+    route_after_analysis,
+    route_after_search,
+    route_to_final_response,
+    route_after_reuse
 )
+from .session import session_store
 
 def create_fund_agent_graph() -> StateGraph:
     """
     Create the fund agent workflow graph.
     
+    After the search, the graph branches on the query intent: latest-NAV
+    queries fetch a single NAV row and go straight to the final response,
+    SIP and lump-sum questions run the portfolio simulator, and returns,
+    history and comparison queries fetch fund details and run the analysis
+    step. Follow-up queries whose funds and data were already fetched
+    earlier in the session skip the search and fetch steps.
+    
     Returns:
         StateGraph: The configured workflow graph
     """
@@ -23,12 +38,48 @@ def create_fund_agent_graph() -> StateGraph:
     graph.add_node("analyze_query", analyze_query)
     graph.add_node("search_funds", search_funds)
     graph.add_node("fetch_fund_details", fetch_fund_details)
+    graph.add_node("fetch_latest_nav", fetch_latest_nav)
+    graph.add_node("simulate_portfolio", simulate_portfolio)
+    graph.add_node("reuse_session_context", reuse_session_context)
     graph.add_node("analyze_funds", analyze_funds)
     graph.add_node("generate_final_response", generate_final_response)
     
     # Define the workflow
-    graph.add_edge("analyze_query", "search_funds")
-    graph.add_edge("search_funds", "fetch_fund_details")
+    graph.add_conditional_edges(
+        "analyze_query",
+        route_after_analysis,
+        {
+            "search_funds": "search_funds",
+            "reuse_session_context": "reuse_session_context"
+        }
+    )
+    graph.add_conditional_edges(
+        "search_funds",
+        route_after_search,
+        {
+            "fetch_latest_nav": "fetch_latest_nav",
+            "simulate_portfolio": "simulate_portfolio",
+            "fetch_fund_details": "fetch_fund_details"
+        }
+    )
+    for node_name in ("fetch_latest_nav", "simulate_portfolio"):
+        graph.add_conditional_edges(
+            node_name,
+            route_to_final_response,
+            {
+                "generate_final_response": "generate_final_response",
+                "end": END
+            }
+        )
+    graph.add_conditional_edges(
+        "reuse_session_context",
+        route_after_reuse,
+        {
+            "analyze_funds": "analyze_funds",
+            "simulate_portfolio": "simulate_portfolio",
+            "generate_final_response": "generate_final_response"
+        }
+    )
     graph.add_edge("fetch_fund_details", "analyze_funds")
     graph.add_edge("analyze_funds", "generate_final_response")
     graph.add_edge("generate_final_response", END)
@@ -38,12 +89,32 @@ def create_fund_agent_graph() -> StateGraph:
     
     return graph
 
-async def process_query(query: str) -> str:
+async def build_initial_state(query: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the initial agent state, including the session's context if any.
+    
+    Args:
+        query: User query about mutual funds
+        session_id: Optional session ID of an ongoing conversation
+        
+    Returns:
+        Dict: Initial agent state
+    """
+    session = await session_store.get(session_id) if session_id else None
+    
+    return {
+        "query": query,
+        "session": session,
+        "chat_history": session.chat_history() if session else []
+    }
+
+async def process_query(query: str, session_id: Optional[str] = None) -> str:
     """
     Process a user query through the fund agent.
     
     Args:
         query: User query about mutual funds
+        session_id: Optional session ID; the turn's context is saved to it
         
     Returns:
         str: Agent's response
@@ -52,16 +123,20 @@ async def process_query(query: str) -> str:
     fund_agent = create_fund_agent_graph().compile()
     
     # Run the agent
-    result = await fund_agent.ainvoke({"query": query, "chat_history": []})
+    result = await fund_agent.ainvoke(await build_initial_state(query, session_id))
+    
+    if session_id:
+        await session_store.save(session_id, result)
     
     return result["response"]
 
-async def process_query_stream(query: str) -> AsyncIterator[str]:
+async def process_query_stream(query: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
     """
     Process a user query and stream the response.
     
     Args:
         query: User query about mutual funds
+        session_id: Optional session ID; the turn's context is saved to it
         
     Yields:
         str: Chunks of the agent's response
@@ -70,10 +145,12 @@ async def process_query_stream(query: str) -> AsyncIterator[str]:
     fund_agent = create_fund_agent_graph().compile()
     
     # Stream the agent execution
-    async for event in fund_agent.astream({"query": query, "chat_history": []}):
+    async for event in fund_agent.astream(await build_initial_state(query, session_id)):
         # Stream only final response chunks
         if event["type"] == "on_chain_end" and event["name"] == "generate_final_response":
             if "response" in event["data"]:
+                if session_id:
+                    await session_store.save(session_id, event["data"])
                 yield event["data"]["response"]
         
         # Yield node completion messages
@@ -85,5 +162,11 @@ async def process_query_stream(query: str) -> AsyncIterator[str]:
                 yield "Searching for relevant mutual funds...\n\n"
             elif node_name == "fetch_fund_details":
                 yield "Fetching detailed fund information...\n\n"
+            elif node_name == "fetch_latest_nav":
+                yield "Fetching the latest NAV...\n\n"
+            elif node_name == "simulate_portfolio":
+                yield "Simulating the investment over historical NAVs...\n\n"
+            elif node_name == "reuse_session_context":
+                yield "Using the funds from our conversation...\n\n"
             elif node_name == "analyze_funds":
                 yield "Analyzing fund performance and characteristics...\n\n"
\ No newline at end of file
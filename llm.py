@@ -1,7 +1,18 @@
 from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import BaseMessage
 from .config import settings
+from .cache import create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = "gpt-4-turbo"
+
+# Cache for LLM responses, shared between workers when a shared backend is configured
+llm_cache = create_cache_backend("llm", max_entries=settings.llm_cache_max_entries)
 
 def create_llm(temperature: float = 0.1, streaming: bool = False, callbacks: Optional[list] = None) -> ChatOpenAI:
     """
@@ -16,7 +27,7 @@ def create_llm(temperature: float = 0.1, streaming: bool = False, callbacks: Opt
         ChatOpenAI: Configured LLM instance
     """
     return ChatOpenAI(
-        model="gpt-4-turbo",
+        model=LLM_MODEL,
         temperature=temperature,
         api_key=settings.openai_api_key,
         streaming=streaming,
@@ -28,6 +39,8 @@ async def generate_response(messages: list[BaseMessage], temperature: float = 0.
     """
     Generate a response from the LLM.
     
+    Identical prompts are answered from the LLM response cache.
+    
     Args:
         messages: List of conversation messages
         temperature: Creativity level of the model
@@ -35,6 +48,32 @@ async def generate_response(messages: list[BaseMessage], temperature: float = 0.
     Returns:
         str: Generated response
     """
+    cache_key = _llm_cache_key(messages, temperature)
+    if settings.enable_llm_cache:
+        try:
+            cached = await llm_cache.get(cache_key)
+        except Exception as e:
+            logger.error(f"Error reading LLM cache: {str(e)}")
+            cached = None
+        if cached is not None:
+            return cached
+    
     llm = create_llm(temperature=temperature)
     response = await llm.agenerate([messages])
-    return response.generations[0][0].text
\ No newline at end of file
+    text = response.generations[0][0].text
+    
+    if settings.enable_llm_cache:
+        try:
+            await llm_cache.set(cache_key, text, ttl=settings.llm_cache_ttl)
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {str(e)}")
+    
+    return text
+
+def _llm_cache_key(messages: list[BaseMessage], temperature: float) -> str:
+    """Build a cache key from the model, temperature and message contents."""
+    payload = json.dumps(
+        [LLM_MODEL, temperature, [[message.type, message.content] for message in messages]],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
\ No newline at end of file
@@ -0,0 +1,21 @@
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from brotli_asgi import BrotliMiddleware
+
+from .core.config import settings
+from .api.routes import router
+
+app = FastAPI(
+    title="Agentic AI Fund Search",
+    description="Search, summarize and reason over mutual fund data from MFAPI.in",
+    default_response_class=ORJSONResponse
+)
+
+# Brotli for clients that accept it, gzip for the rest
+app.add_middleware(
+    BrotliMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_fallback=True
+)
+
+app.include_router(router, prefix="/api")
@@ -1,9 +1,12 @@
 import httpx
 import json
-from typing import Dict, List, Any, Optional, Union
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import logging
+from collections import Counter
 from ..core.config import settings
+from ..core.cache import create_cache_backend
 from ..schemas.fund import FundSummary, FundDetail, NavDataPoint
 
 logger = logging.getLogger(__name__)
@@ -14,7 +17,8 @@ class MutualFundService:
     def __init__(self):
         self.base_url = settings.mfapi_base_url
         self.timeout = settings.mfapi_timeout
-        self.cache = {}  # Simple in-memory cache
+        self.cache = create_cache_backend("mfapi", max_entries=settings.mfapi_cache_max_entries)
+        self.access_counts = Counter()  # Fund detail requests per scheme code
         
     async def search_funds(self, query: str, limit: int = 10) -> List[FundSummary]:
         """
@@ -28,36 +32,33 @@ class MutualFundService:
             List of FundSummary objects
         """
         cache_key = f"search:{query}:{limit}"
-        if settings.enable_cache and cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Since MFAPI doesn't have a direct search endpoint, 
         # we need to fetch all funds and filter them
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}")
-                response.raise_for_status()
-                all_funds = response.json()
-                
-                # Filter funds based on query
-                filtered_funds = []
-                for fund in all_funds:
-                    if query.lower() in fund.get("schemeName", "").lower():
-                        filtered_funds.append(
-                            FundSummary(
-                                scheme_code=fund.get("schemeCode"),
-                                scheme_name=fund.get("schemeName"),
-                                fund_house=self._extract_fund_house(fund.get("schemeName", ""))
-                            )
+            all_funds = await self._get_catalog()
+            
+            # Filter funds based on query
+            filtered_funds = []
+            for scheme_code, scheme_name in all_funds:
+                if query.lower() in scheme_name.lower():
+                    filtered_funds.append(
+                        FundSummary(
+                            scheme_code=scheme_code,
+                            scheme_name=scheme_name,
+                            fund_house=self._extract_fund_house(scheme_name)
                         )
-                        
-                        if len(filtered_funds) >= limit:
-                            break
-                
-                if settings.enable_cache:
-                    self.cache[cache_key] = filtered_funds
+                    )
                     
-                return filtered_funds
+                    if len(filtered_funds) >= limit:
+                        break
+            
+            await self._cache_set(cache_key, filtered_funds)
+                
+            return filtered_funds
                 
         except httpx.HTTPError as e:
             logger.error(f"Error searching funds: {str(e)}")
@@ -67,6 +68,9 @@ class MutualFundService:
         """
         Get detailed information about a specific fund.
         
+        A download also caches the fund's full NAV history, so a following
+        get_nav_history call doesn't download it again.
+        
         Args:
             scheme_code: Fund scheme code
             include_nav_data: Whether to include historical NAV data
@@ -74,9 +78,12 @@ class MutualFundService:
         Returns:
             FundDetail object or None if not found
         """
+        self.access_counts[scheme_code] += 1
+        
         cache_key = f"fund:{scheme_code}:{include_nav_data}"
-        if settings.enable_cache and cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -84,13 +91,119 @@ class MutualFundService:
                 response.raise_for_status()
                 data = response.json()
                 
+                if data.get("status") == "SUCCESS":
+                    fund_detail = self._build_fund_detail(scheme_code, data, include_nav_data)
+                    
+                    await self._cache_set(cache_key, fund_detail)
+                    await self._cache_nav_history(scheme_code, data.get("data", []))
+                        
+                    return fund_detail
+                
+                return None
+                
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching fund details: {str(e)}")
+            return None
+
+    async def get_nav_history(self, scheme_code: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get the full NAV history of a fund as arrays.
+        
+        Args:
+            scheme_code: Fund scheme code
+            
+        Returns:
+            Tuple of (date ordinals, NAVs) sorted oldest first, or None if not found
+        """
+        cache_key = f"history:{scheme_code}"
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return (
+                np.frombuffer(cached["dates"], dtype=np.int64),
+                np.frombuffer(cached["navs"], dtype=np.float64)
+            )
+        
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{self.base_url}/{scheme_code}")
+                response.raise_for_status()
+                data = response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching NAV history: {str(e)}")
+            return None
+        
+        if data.get("status") != "SUCCESS":
+            return None
+        
+        return await self._cache_nav_history(scheme_code, data.get("data", []))
+
+    async def refresh_fund(self, scheme_code: str) -> bool:
+        """
+        Re-fetch a fund and overwrite all of its cached entries.
+        
+        A single request to MFAPI refreshes the details with and without NAV
+        data, the latest NAV and the full NAV history.
+        
+        Args:
+            scheme_code: Fund scheme code
+            
+        Returns:
+            True if the fund was refreshed
+        """
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{self.base_url}/{scheme_code}")
+                response.raise_for_status()
+                data = response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Error refreshing fund {scheme_code}: {str(e)}")
+            return False
+        
+        if data.get("status") != "SUCCESS":
+            return False
+        
+        # Returns are calculated once and shared by all variants
+        fund_detail = self._build_fund_detail(scheme_code, data, include_nav_data=False)
+        await self._cache_set(f"fund:{scheme_code}:False", fund_detail)
+        await self._cache_set(f"latest:{scheme_code}", fund_detail)
+        await self._cache_set(
+            f"fund:{scheme_code}:True",
+            fund_detail.copy(update={"nav_data": self._nav_points(data.get("data", []))})
+        )
+        await self._cache_nav_history(scheme_code, data.get("data", []))
+        
+        return True
+
+    async def get_latest_nav(self, scheme_code: str) -> Optional[FundDetail]:
+        """
+        Get only the latest NAV for a fund.
+
+        Uses the `/latest` endpoint, which returns a single NAV row instead of
+        the full history, so no returns are calculated.
+
+        Args:
+            scheme_code: Fund scheme code
+
+        Returns:
+            FundDetail object with the latest NAV or None if not found
+        """
+        self.access_counts[scheme_code] += 1
+
+        cache_key = f"latest:{scheme_code}"
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{self.base_url}/{scheme_code}/latest")
+                response.raise_for_status()
+                data = response.json()
+
                 if data.get("status") == "SUCCESS":
                     fund_data = data.get("meta", {})
                     nav_data_raw = data.get("data", [])
-                    
-                    # Calculate returns based on NAV data
-                    returns = self._calculate_returns(nav_data_raw)
-                    
+
                     fund_detail = FundDetail(
                         scheme_code=scheme_code,
                         scheme_name=fund_data.get("scheme_name", ""),
@@ -99,32 +212,126 @@ class MutualFundService:
                         scheme_category=fund_data.get("scheme_category", ""),
                         scheme_nav=float(nav_data_raw[0].get("nav", 0)) if nav_data_raw else None,
                         scheme_nav_date=nav_data_raw[0].get("date", "") if nav_data_raw else None,
-                        one_month_return=returns.get("1M"),
-                        three_month_return=returns.get("3M"),
-                        six_month_return=returns.get("6M"),
-                        one_year_return=returns.get("1Y"),
-                        three_year_return=returns.get("3Y"),
-                        five_year_return=returns.get("5Y"),
                     )
-                    
-                    # Add NAV data if requested
-                    if include_nav_data:
-                        fund_detail.nav_data = [
-                            NavDataPoint(date=item.get("date", ""), nav=float(item.get("nav", 0)))
-                            for item in nav_data_raw[:365]  # Limit to last year
-                        ]
-                    
-                    if settings.enable_cache:
-                        self.cache[cache_key] = fund_detail
-                        
+
+                    await self._cache_set(cache_key, fund_detail)
+
                     return fund_detail
-                
+
                 return None
-                
+
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching fund details: {str(e)}")
+            logger.error(f"Error fetching latest NAV: {str(e)}")
             return None
-            
+
+    async def _cache_get(self, key: str) -> Optional[Any]:
+        """Read from the cache, treating cache errors as misses."""
+        if not settings.enable_cache:
+            return None
+        try:
+            return await self.cache.get(key)
+        except Exception as e:
+            logger.error(f"Error reading cache entry {key}: {str(e)}")
+            return None
+    
+    async def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Write to the cache; a failed write only costs a later cache miss."""
+        if not settings.enable_cache:
+            return
+        try:
+            await self.cache.set(key, value, ttl=ttl)
+        except Exception as e:
+            logger.error(f"Error writing cache entry {key}: {str(e)}")
+    
+    def _build_fund_detail(self, scheme_code: str, data: Dict[str, Any], include_nav_data: bool) -> FundDetail:
+        """Build a FundDetail from an MFAPI scheme response."""
+        fund_data = data.get("meta", {})
+        nav_data_raw = data.get("data", [])
+        
+        # Calculate returns based on NAV data
+        returns = self._calculate_returns(nav_data_raw)
+        
+        fund_detail = FundDetail(
+            scheme_code=scheme_code,
+            scheme_name=fund_data.get("scheme_name", ""),
+            fund_house=fund_data.get("fund_house", ""),
+            scheme_type=fund_data.get("scheme_type", ""),
+            scheme_category=fund_data.get("scheme_category", ""),
+            scheme_nav=float(nav_data_raw[0].get("nav", 0)) if nav_data_raw else None,
+            scheme_nav_date=nav_data_raw[0].get("date", "") if nav_data_raw else None,
+            one_month_return=returns.get("1M"),
+            three_month_return=returns.get("3M"),
+            six_month_return=returns.get("6M"),
+            one_year_return=returns.get("1Y"),
+            three_year_return=returns.get("3Y"),
+            five_year_return=returns.get("5Y"),
+        )
+        
+        # Add NAV data if requested
+        if include_nav_data:
+            fund_detail.nav_data = self._nav_points(nav_data_raw)
+        
+        return fund_detail
+    
+    def _nav_points(self, nav_data_raw: List[Dict[str, Any]]) -> List[NavDataPoint]:
+        """Convert MFAPI NAV rows to NAV points, limited to the last year."""
+        return [
+            NavDataPoint(date=item.get("date", ""), nav=float(item.get("nav", 0)))
+            for item in nav_data_raw[:365]  # Limit to last year
+        ]
+    
+    async def _cache_nav_history(self, scheme_code: str, nav_data_raw: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert MFAPI NAV rows to arrays and cache them as the fund's NAV history."""
+        dates, navs = self._nav_arrays(nav_data_raw)
+        await self._cache_set(f"history:{scheme_code}", {"dates": dates.tobytes(), "navs": navs.tobytes()})
+        return dates, navs
+    
+    def _nav_arrays(self, nav_data_raw: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert MFAPI NAV rows to (date ordinals, NAVs) arrays sorted oldest first."""
+        dates = []
+        navs = []
+        for item in nav_data_raw:
+            nav = float(item.get("nav", 0))
+            # Skip rows without a published NAV
+            if nav <= 0:
+                continue
+            day, month, year = item.get("date", "").split("-")
+            dates.append(datetime(int(year), int(month), int(day)).toordinal())
+            navs.append(nav)
+        
+        dates = np.array(dates, dtype=np.int64)
+        navs = np.array(navs, dtype=np.float64)
+        dates, first = np.unique(dates, return_index=True)
+        
+        return dates, navs[first]
+    
+    async def _get_catalog(self) -> List[List[str]]:
+        """
+        Get the list of all schemes as [scheme_code, scheme_name] pairs.
+        
+        The catalog is cached on its own so every search term reuses a single
+        download.
+        
+        Returns:
+            List of [scheme_code, scheme_name] pairs
+        """
+        cache_key = "catalog"
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(f"{self.base_url}")
+            response.raise_for_status()
+            catalog = [
+                [str(fund.get("schemeCode")), fund.get("schemeName", "")]
+                for fund in response.json()
+            ]
+        
+        await self._cache_set(cache_key, catalog, ttl=settings.catalog_cache_ttl)
+        
+        return catalog
+    
     def _extract_fund_house(self, scheme_name: str) -> str:
         """Extract fund house from scheme name."""
         common_fund_houses = [
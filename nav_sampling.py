@@ -0,0 +1,127 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..schemas.fund import NavDataPoint
+
+NAV_DATE_FORMAT = "%d-%m-%Y"
+
+SAMPLING_METHODS = ("weekly", "monthly", "lttb")
+
+def parse_nav_date(value: str) -> date:
+    """Parse an MFAPI NAV date (dd-mm-yyyy)."""
+    return datetime.strptime(value, NAV_DATE_FORMAT).date()
+
+def nav_points_in_range(
+    nav_history: Tuple[np.ndarray, np.ndarray],
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> List[NavDataPoint]:
+    """
+    Build NAV points between two dates, both inclusive, from a full NAV history.
+
+    Args:
+        nav_history: (date ordinals, NAVs) sorted oldest first, as returned
+            by MutualFundService.get_nav_history
+        start: First date to keep
+        end: Last date to keep
+
+    Returns:
+        List of NAV points, most recent first as returned by MFAPI
+    """
+    dates, navs = nav_history
+    first = np.searchsorted(dates, start.toordinal(), side="left") if start else 0
+    last = np.searchsorted(dates, end.toordinal(), side="right") if end else len(dates)
+
+    return [
+        NavDataPoint(date=date.fromordinal(int(ordinal)).strftime(NAV_DATE_FORMAT), nav=float(nav))
+        for ordinal, nav in zip(dates[first:last][::-1], navs[first:last][::-1])
+    ]
+
+def downsample_nav(nav_data: List[NavDataPoint], method: str, max_points: int = 100) -> List[NavDataPoint]:
+    """
+    Reduce the number of NAV points.
+
+    Args:
+        nav_data: NAV points, most recent first as returned by MFAPI
+        method: "weekly" or "monthly" to keep the last NAV of each period,
+            or "lttb" to keep the max_points that best preserve the curve shape
+        max_points: Number of points to keep with "lttb"
+
+    Returns:
+        List of NAV points, most recent first
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method: {method}")
+
+    # Work oldest first
+    ordered = sorted(nav_data, key=lambda point: parse_nav_date(point.date))
+
+    if method == "lttb":
+        sampled = _largest_triangle_three_buckets(ordered, max_points)
+    else:
+        sampled = _last_per_period(ordered, method)
+
+    return sampled[::-1]
+
+def _last_per_period(ordered: List[NavDataPoint], method: str) -> List[NavDataPoint]:
+    """Keep the last NAV point of each ISO week or calendar month."""
+    sampled = []
+    current_period = None
+
+    for point in ordered:
+        point_date = parse_nav_date(point.date)
+        if method == "weekly":
+            period = point_date.isocalendar()[:2]
+        else:
+            period = (point_date.year, point_date.month)
+
+        if period == current_period:
+            sampled[-1] = point
+        else:
+            sampled.append(point)
+            current_period = period
+
+    return sampled
+
+def _largest_triangle_three_buckets(ordered: List[NavDataPoint], threshold: int) -> List[NavDataPoint]:
+    """Downsample with Largest-Triangle-Three-Buckets, keeping the first and last points."""
+    n = len(ordered)
+    if threshold >= n or threshold < 3:
+        return ordered
+
+    xs = [parse_nav_date(point.date).toordinal() for point in ordered]
+    ys = [point.nav for point in ordered]
+
+    sampled = [ordered[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        # Point in the current bucket forming the largest triangle
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        selected = start
+        max_area = -1.0
+
+        for j in range(start, end):
+            area = abs(
+                (xs[previous] - avg_x) * (ys[j] - ys[previous])
+                - (xs[previous] - xs[j]) * (avg_y - ys[previous])
+            )
+            if area > max_area:
+                max_area = area
+                selected = j
+
+        sampled.append(ordered[selected])
+        previous = selected
+
+    sampled.append(ordered[-1])
+    return sampled
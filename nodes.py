@@ -1,17 +1,39 @@
 from typing import Dict, List, Any, Tuple, Optional
+from datetime import date
 import json
 import re
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 from ..services.mfapi_service import mutual_fund_service
+from ..services.portfolio_simulator import portfolio_simulator
+from ..schemas.request import InvestmentScenario
 from ..core.llm import generate_response
 from .prompts import (
     QUERY_ANALYSIS_PROMPT,
     FUND_SEARCH_PROMPT,
     FUND_ANALYSIS_PROMPT,
     FUND_COMPARISON_PROMPT,
+    SIMULATION_PARAMS_PROMPT,
     FINAL_RESPONSE_PROMPT
 )
 
+# Query intents and the data each one needs from MFAPI
+INTENT_NAV = "nav"
+INTENT_RETURNS = "returns"
+INTENT_HISTORY = "history"
+INTENT_COMPARISON = "comparison"
+INTENT_SIMULATION = "simulation"
+
+# max_funds caps the funds fetched; the count follows the fund names that
+# matched a search result, and comparisons fetch at least two funds
+INTENT_DATA_REQUIREMENTS = {
+    INTENT_NAV: {"latest_only": True, "include_nav_data": False, "max_funds": 5},
+    INTENT_RETURNS: {"latest_only": False, "include_nav_data": False, "max_funds": 5},
+    INTENT_HISTORY: {"latest_only": False, "include_nav_data": True, "max_funds": 3},
+    INTENT_COMPARISON: {"latest_only": False, "include_nav_data": False, "max_funds": 5},
+    # Simulations read the full NAV history through the portfolio simulator
+    INTENT_SIMULATION: {"latest_only": False, "include_nav_data": False, "max_funds": 5},
+}
+
 async def analyze_query(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze the user query to understand intent and extract key information.
@@ -36,11 +58,15 @@ async def analyze_query(state: Dict[str, Any]) -> Dict[str, Any]:
     # Extract fund names if mentioned
     fund_names = extract_fund_names(analysis)
     
+    # Decide what data this query needs
+    intent = classify_intent(query)
+    
     # Update state
     return {
         **state,
         "query_analysis": analysis,
         "fund_names": fund_names,
+        "intent": intent,
         "chat_history": chat_history + [
             HumanMessage(content=query),
             AIMessage(content="I'm analyzing your query about mutual funds.")
@@ -103,6 +129,10 @@ async def fetch_fund_details(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Fetch detailed information for the funds found.
     
+    Only the data required by the query intent is fetched: NAV history is
+    included for history queries, and one fund is fetched per mentioned
+    name.
+    
     Args:
         state: Current state containing search results
         
@@ -111,14 +141,17 @@ async def fetch_fund_details(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     search_results = state.get("search_results", [])
     chat_history = state.get("chat_history", [])
+    intent = state.get("intent", INTENT_RETURNS)
+    requirements = INTENT_DATA_REQUIREMENTS[intent]
     
-    # Get details for top funds (limit to 3 to avoid rate limiting)
     fund_details = []
     
-    for fund in search_results[:3]:
+    min_funds = 2 if intent == INTENT_COMPARISON else 1
+    
+    for fund in select_funds(state, requirements["max_funds"], min_funds=min_funds):
         details = await mutual_fund_service.get_fund_details(
             fund.scheme_code, 
-            include_nav_data=True
+            include_nav_data=requirements["include_nav_data"]
         )
         if details:
             fund_details.append(details)
@@ -126,11 +159,146 @@ async def fetch_fund_details(state: Dict[str, Any]) -> Dict[str, Any]:
     return {
         **state,
         "fund_details": fund_details,
+        "fetched_data": requirements,
         "chat_history": chat_history + [
             AIMessage(content=f"I've gathered detailed information on {len(fund_details)} funds.")
         ]
     }
 
+async def fetch_latest_nav(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fetch only the latest NAV for each fund mentioned, or the top fund found.
+    
+    Args:
+        state: Current state containing search results
+        
+    Returns:
+        Updated state with fund details and NAV context for the final response
+    """
+    chat_history = state.get("chat_history", [])
+    
+    fund_details = []
+    
+    for fund in select_funds(state, INTENT_DATA_REQUIREMENTS[INTENT_NAV]["max_funds"]):
+        details = await mutual_fund_service.get_latest_nav(fund.scheme_code)
+        if details:
+            fund_details.append(details)
+    
+    if not fund_details:
+        return {
+            **state,
+            "fund_details": [],
+            "response": "I couldn't find any mutual funds matching your query. Could you please provide more specific information?",
+            "chat_history": chat_history + [
+                AIMessage(content="I couldn't find any mutual funds matching your query.")
+            ]
+        }
+    
+    # Latest NAV needs no analysis step, pass it straight to the final response
+    return {
+        **state,
+        "fund_details": fund_details,
+        "fund_analysis": summarize_latest_nav(fund_details),
+        "fetched_data": INTENT_DATA_REQUIREMENTS[INTENT_NAV],
+        "chat_history": chat_history + [
+            AIMessage(content=f"I've fetched the latest NAV for {len(fund_details)} funds.")
+        ]
+    }
+
+async def simulate_portfolio(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Simulate the SIP or lump-sum investment described in the query.
+    
+    The funds are the ones reused from the session, or one search result
+    per fund name that matched, falling back to the top result.
+    
+    Args:
+        state: Current state containing search results or reused fund details
+        
+    Returns:
+        Updated state with the simulation results as analysis
+    """
+    query = state["query"]
+    chat_history = state.get("chat_history", [])
+    funds = state.get("fund_details") or select_funds(state, INTENT_DATA_REQUIREMENTS[INTENT_SIMULATION]["max_funds"])
+    
+    no_result = {
+        **state,
+        "response": "I couldn't simulate that investment. Could you mention the funds, the amount and the start date?",
+        "chat_history": chat_history + [
+            AIMessage(content="I couldn't simulate that investment.")
+        ]
+    }
+    
+    if not funds:
+        return no_result
+    
+    messages = SIMULATION_PARAMS_PROMPT.format_messages(
+        query=query,
+        funds="\n".join(f"{i}. {fund.scheme_name}" for i, fund in enumerate(funds, start=1)),
+        today=date.today().isoformat(),
+        chat_history=chat_history
+    )
+    scenario = parse_simulation_scenario(await generate_response(messages))
+    
+    if scenario is None:
+        return no_result
+    
+    try:
+        simulation = await portfolio_simulator.simulate([fund.scheme_code for fund in funds], [scenario])
+    except (LookupError, ValueError) as e:
+        return {
+            **no_result,
+            "response": f"I couldn't simulate that investment: {str(e)}"
+        }
+    
+    result = simulation.scenarios[0].dict()
+    result["funds"] = {fund.scheme_code: fund.scheme_name for fund in funds}
+    
+    return {
+        **state,
+        "fund_analysis": f"Investment simulation over historical NAVs:\n{json.dumps(result, indent=2, default=str)}",
+        "chat_history": chat_history + [
+            AIMessage(content=f"I've simulated the investment across {len(funds)} funds.")
+        ]
+    }
+
+async def reuse_session_context(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reuse the funds fetched earlier in the session instead of searching again.
+    
+    Follow-ups refer back to every fund of the conversation ("they",
+    "both"), so all of the session's funds are reused and several funds
+    are compared.
+    
+    Args:
+        state: Current state containing the session context
+        
+    Returns:
+        Updated state with the session's search results and fund details
+    """
+    session = state["session"]
+    chat_history = state.get("chat_history", [])
+    intent = state.get("intent", INTENT_RETURNS)
+    fund_details = session.fund_details[:INTENT_DATA_REQUIREMENTS[intent]["max_funds"]]
+    
+    if len(fund_details) >= 2 and intent in (INTENT_RETURNS, INTENT_HISTORY):
+        intent = INTENT_COMPARISON
+    
+    updates = {
+        "intent": intent,
+        "search_results": session.search_results,
+        "fund_details": fund_details,
+        "chat_history": chat_history + [
+            AIMessage(content=f"I'm using the {len(fund_details)} funds from our conversation.")
+        ]
+    }
+    
+    if intent == INTENT_NAV:
+        updates["fund_analysis"] = summarize_latest_nav(fund_details)
+    
+    return {**state, **updates}
+
 async def analyze_funds(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze fund data based on user query.
@@ -154,13 +322,14 @@ async def analyze_funds(state: Dict[str, Any]) -> Dict[str, Any]:
             ]
         }
     
-    # Check if this is a comparison query
-    if len(fund_details) >= 2 and is_comparison_query(query):
-        # Compare top 2 funds
+    # Compare every fetched fund when the query covers several
+    if len(fund_details) >= 2:
         messages = FUND_COMPARISON_PROMPT.format_messages(
             query=query,
-            fund_data_1=json.dumps(fund_details[0].dict(), indent=2),
-            fund_data_2=json.dumps(fund_details[1].dict(), indent=2),
+            fund_data="\n\n".join(
+                f"Fund {i}:\n{fund_to_json(fund)}"
+                for i, fund in enumerate(fund_details, start=1)
+            ),
             chat_history=chat_history
         )
         
@@ -170,7 +339,7 @@ async def analyze_funds(state: Dict[str, Any]) -> Dict[str, Any]:
         # Analyze single fund
         messages = FUND_ANALYSIS_PROMPT.format_messages(
             query=query,
-            fund_data=json.dumps(fund_details[0].dict(), indent=2),
+            fund_data=fund_to_json(fund_details[0]),
             chat_history=chat_history
         )
         
@@ -217,8 +386,182 @@ async def generate_final_response(state: Dict[str, Any]) -> Dict[str, Any]:
         ]
     }
 
+# Routing functions
+
+def route_after_analysis(state: Dict[str, Any]) -> str:
+    """Skip search and fetch when the session already has the data the query needs."""
+    if context_covers_query(state):
+        return "reuse_session_context"
+    return "search_funds"
+
+def route_after_reuse(state: Dict[str, Any]) -> str:
+    """Latest-NAV queries need no analysis step and simulations run on the session's funds."""
+    if state.get("intent") == INTENT_NAV:
+        return "generate_final_response"
+    if state.get("intent") == INTENT_SIMULATION:
+        return "simulate_portfolio"
+    return "analyze_funds"
+
+def route_after_search(state: Dict[str, Any]) -> str:
+    """Pick the fetch node for the query intent."""
+    if state.get("intent") == INTENT_NAV:
+        return "fetch_latest_nav"
+    if state.get("intent") == INTENT_SIMULATION:
+        return "simulate_portfolio"
+    return "fetch_fund_details"
+
+def route_to_final_response(state: Dict[str, Any]) -> str:
+    """Skip the final response if no fund was found or nothing could be computed."""
+    if state.get("response"):
+        return "end"
+    return "generate_final_response"
+
 # Helper functions
 
+def classify_intent(query: str) -> str:
+    """
+    Classify the data the query needs: a simulation, a comparison, full history, latest NAV or returns.
+    
+    Only the query wording is used. The fund names extracted from the LLM
+    analysis also pick up lines like "Fund house: HDFC", so their count
+    doesn't tell a comparison apart from a single-fund query.
+    """
+    query_lower = query.lower()
+    
+    simulation_keywords = ["sip", "sips", "lump sum", "lumpsum", "had invested", "if i invest", "simulate"]
+    if any(re.search(rf"\b{keyword}\b", query_lower) for keyword in simulation_keywords):
+        return INTENT_SIMULATION
+    
+    # "What if" alone is any hypothetical; it needs an amount or investing nearby
+    what_if_pattern = (
+        r"\bwhat if\b[^.?!]{0,40}?"
+        r"(\binvest|\bsip\b|\blump ?sum|\bput\b|₹|\brs\.?\s*\d|\binr\b|\brupees\b"
+        r"|\b\d[\d,.]*\s*(k|lakhs?|lacs?|crores?|cr|thousand)\b|\b\d{1,3}(,\d{2,3})+\b)"
+    )
+    if re.search(what_if_pattern, query_lower):
+        return INTENT_SIMULATION
+    
+    if is_comparison_query(query):
+        return INTENT_COMPARISON
+    
+    history_keywords = [
+        "history", "historical", "trend", "chart", "over time", "since",
+        "volatility", "volatile", "drawdown", "daily"
+    ]
+    if any(re.search(rf"\b{keyword}", query_lower) for keyword in history_keywords):
+        return INTENT_HISTORY
+    
+    # Whole words only: scheme names are full of "Growth" and "Opportunities"
+    returns_patterns = [
+        r"\breturns?\b", r"\bcagr\b", r"\bperform(ance|ed|ing|s)?\b", r"\bannuali[sz]ed\b",
+        r"\b(\d+|one|two|three|five|ten)[ -]?(years?|yrs?)\b",
+    ]
+    nav_keywords = ["nav", "net asset value", "price", "latest value"]
+    if (
+        any(re.search(rf"\b{keyword}\b", query_lower) for keyword in nav_keywords)
+        and not any(re.search(pattern, query_lower) for pattern in returns_patterns)
+    ):
+        return INTENT_NAV
+    
+    return INTENT_RETURNS
+
+def context_covers_query(state: Dict[str, Any]) -> bool:
+    """Check whether the query follows up on the session's funds and their fetched data can answer it."""
+    session = state.get("session")
+    if session is None or not session.fund_details:
+        return False
+    
+    # A query without any reference back to the conversation is a new question
+    if not is_follow_up_query(state["query"]):
+        return False
+    
+    # Funds named in the query must be ones already fetched
+    fetched_names = [fund.scheme_name.lower() for fund in session.fund_details]
+    for fund_name in state.get("fund_names", []):
+        if not any(fund_name.lower() in name or name in fund_name.lower() for name in fetched_names):
+            return False
+    
+    requirements = INTENT_DATA_REQUIREMENTS[state.get("intent", INTENT_RETURNS)]
+    if session.latest_only and not requirements["latest_only"]:
+        return False
+    if requirements["include_nav_data"] and not session.include_nav_data:
+        return False
+    if state.get("intent") == INTENT_COMPARISON and len(session.fund_details) < 2:
+        return False
+    
+    return True
+
+def is_follow_up_query(query: str) -> bool:
+    """Determine if the query refers back to funds from earlier in the conversation."""
+    follow_up_patterns = [
+        r"^\s*(and|also|what about|how about|then)\b",
+        r"\b(it|its|it's|they|them|their|these|those|both|either|same|above|previous|earlier)\b",
+        r"\b(this|that) (fund|one|scheme)\b",
+    ]
+    
+    query_lower = query.lower()
+    return any(re.search(pattern, query_lower) for pattern in follow_up_patterns)
+
+def select_funds(state: Dict[str, Any], max_funds: int, min_funds: int = 1) -> List[Any]:
+    """
+    Pick the funds to fetch: one search result per mentioned fund name.
+    
+    Only names that match a search result count, since the names extracted
+    from the analysis also pick up lines like "Information sought: returns
+    of the fund". Without any matching name the top result is used.
+    
+    Args:
+        state: Current state containing fund names and search results
+        max_funds: Maximum number of funds
+        min_funds: Number of funds to fill up to from the other results
+        
+    Returns:
+        List of FundSummary objects
+    """
+    search_results = state.get("search_results", [])
+    
+    selected = matched_funds(state)[:max_funds]
+    
+    # Fill up with the remaining results if too few names matched
+    for fund in search_results:
+        if len(selected) >= max(min_funds, 1):
+            break
+        if fund not in selected:
+            selected.append(fund)
+    
+    return selected
+
+def matched_funds(state: Dict[str, Any]) -> List[Any]:
+    """Get the first search result matching each mentioned fund name, in the order mentioned."""
+    fund_names = state.get("fund_names", [])
+    search_results = state.get("search_results", [])
+    
+    # Match the most specific names first, so a name already covered by a
+    # picked fund (like its fund house) doesn't add another plan of it
+    matched = {}
+    for position in sorted(range(len(fund_names)), key=lambda i: -len(fund_names[i])):
+        fund_name = fund_names[position].lower()
+        if any(fund_name in fund.scheme_name.lower() for fund in matched.values()):
+            continue
+        for fund in search_results:
+            if fund_name in fund.scheme_name.lower():
+                matched[position] = fund
+                break
+    
+    return [matched[position] for position in sorted(matched)]
+
+def summarize_latest_nav(fund_details: List[Any]) -> str:
+    """Describe the latest NAV of each fund for the final response."""
+    return "\n".join(
+        f"{fund.scheme_name} ({fund.scheme_code}): NAV {fund.scheme_nav} as of {fund.scheme_nav_date}"
+        for fund in fund_details
+    )
+
+def fund_to_json(fund: Any) -> str:
+    """Serialize fund details for a prompt, leaving out empty fields."""
+    return json.dumps(fund.dict(exclude_none=True), indent=2)
+
+
 def extract_fund_names(analysis: str) -> List[str]:
     """Extract fund names from query analysis."""
     fund_names = []
@@ -233,6 +576,22 @@ def extract_fund_names(analysis: str) -> List[str]:
     
     return fund_names
 
+def parse_simulation_scenario(params_text: str) -> Optional[InvestmentScenario]:
+    """Parse the investment scenario JSON from the LLM response."""
+    json_match = re.search(r'\{.*\}', params_text, re.DOTALL)
+    if not json_match:
+        return None
+    
+    try:
+        params = json.loads(json_match.group(0))
+        scenario = InvestmentScenario(**{key: value for key, value in params.items() if value is not None})
+    except (ValueError, TypeError):
+        return None
+    
+    if scenario.lump_sum <= 0 and scenario.sip_amount <= 0:
+        return None
+    return scenario
+
 def parse_search_terms(search_terms_text: str) -> List[str]:
     """Parse search terms from LLM response."""
     # Try to find a list in the text
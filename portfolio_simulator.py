@@ -0,0 +1,336 @@
+import asyncio
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..schemas.request import (
+    InvestmentScenario,
+    FundHolding,
+    ValuePoint,
+    ScenarioResult,
+    PortfolioSimulationResponse
+)
+from .mfapi_service import mutual_fund_service
+
+SIP_FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3}
+
+class PortfolioSimulator:
+    """
+    Simulates SIP and lump-sum investments over historical NAVs.
+
+    All scenarios of a request are evaluated together: the NAV histories are
+    aligned on a common date grid, every scenario's cash flows become a row of
+    a padded matrix, and units, values and XIRR are computed with array
+    operations across all scenarios at once.
+    """
+
+    def __init__(self, service=mutual_fund_service):
+        self.service = service
+
+    async def simulate(
+        self,
+        scheme_codes: List[str],
+        scenarios: List[InvestmentScenario],
+        include_value_curve: bool = False
+    ) -> PortfolioSimulationResponse:
+        """
+        Simulate investment scenarios over a portfolio of funds.
+
+        Args:
+            scheme_codes: Scheme codes of the funds in the portfolio
+            scenarios: Investment scenarios to simulate
+            include_value_curve: Whether to include month-end value curves
+
+        Returns:
+            PortfolioSimulationResponse with one result per scenario
+
+        Raises:
+            LookupError: If a fund has no NAV history
+            ValueError: If the scenarios don't fit the available NAV history
+        """
+        histories = await asyncio.gather(
+            *(self.service.get_nav_history(scheme_code) for scheme_code in scheme_codes)
+        )
+        missing = [
+            scheme_code for scheme_code, history in zip(scheme_codes, histories)
+            if history is None or len(history[0]) == 0
+        ]
+        if missing:
+            raise LookupError(f"No NAV history for: {', '.join(missing)}")
+
+        # The array work takes up to seconds for large requests, so it runs
+        # off the event loop
+        return await asyncio.to_thread(self._simulate, scheme_codes, histories, scenarios, include_value_curve)
+
+    def _simulate(
+        self,
+        scheme_codes: List[str],
+        histories: List[Tuple[np.ndarray, np.ndarray]],
+        scenarios: List[InvestmentScenario],
+        include_value_curve: bool
+    ) -> PortfolioSimulationResponse:
+        """Run the simulation on fetched NAV histories."""
+        grid, navs = align_nav_histories(histories)
+        weights = scenario_weights(scenarios, len(scheme_codes))
+        indices, amounts, end_indices = build_cash_flows(grid, scenarios)
+
+        # Units bought per instalment and fund, summed over instalments
+        units = (amounts[:, :, None] * weights[:, None, :] / navs[indices]).sum(axis=1)
+        fund_invested = amounts.sum(axis=1)[:, None] * weights
+        holding_values = units * navs[end_indices]
+
+        invested = fund_invested.sum(axis=1)
+        final_values = holding_values.sum(axis=1)
+        rates = xirr(amounts, grid[indices], final_values, grid[end_indices])
+
+        curves = None
+        if include_value_curve:
+            curves = value_curves(grid, navs, weights, indices, amounts, end_indices)
+
+        results = []
+        for i, scenario in enumerate(scenarios):
+            results.append(ScenarioResult(
+                name=scenario.name,
+                start_date=date.fromordinal(int(grid[indices[i, 0]])),
+                end_date=date.fromordinal(int(grid[end_indices[i]])),
+                invested=round(float(invested[i]), 2),
+                final_value=round(float(final_values[i]), 2),
+                absolute_return=(
+                    round(float((final_values[i] - invested[i]) / invested[i] * 100), 2)
+                    if invested[i] > 0 else None
+                ),
+                xirr=round(float(rates[i]) * 100, 2) + 0.0 if np.isfinite(rates[i]) else None,
+                holdings=[
+                    FundHolding(
+                        scheme_code=scheme_code,
+                        invested=round(float(fund_invested[i, f]), 2),
+                        units=round(float(units[i, f]), 4),
+                        value=round(float(holding_values[i, f]), 2)
+                    )
+                    for f, scheme_code in enumerate(scheme_codes)
+                ],
+                value_curve=curves[i] if curves is not None else None
+            ))
+
+        return PortfolioSimulationResponse(scheme_codes=scheme_codes, scenarios=results)
+
+# Array helpers
+
+def align_nav_histories(histories: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Align NAV histories on the dates where all funds have data.
+
+    Args:
+        histories: (date ordinals, NAVs) per fund, sorted oldest first
+
+    Returns:
+        Tuple of (date grid, NAV matrix of shape dates x funds); a fund
+        without a NAV on a grid date carries its previous NAV forward
+    """
+    start = max(dates[0] for dates, _ in histories)
+    end = min(dates[-1] for dates, _ in histories)
+    if start > end:
+        raise ValueError("The funds have no overlapping NAV history")
+
+    grid = np.unique(np.concatenate([
+        dates[(dates >= start) & (dates <= end)] for dates, _ in histories
+    ]))
+
+    navs = np.empty((len(grid), len(histories)))
+    for f, (dates, fund_navs) in enumerate(histories):
+        navs[:, f] = fund_navs[np.searchsorted(dates, grid, side="right") - 1]
+
+    return grid, navs
+
+def scenario_weights(scenarios: List[InvestmentScenario], fund_count: int) -> np.ndarray:
+    """Build the scenarios x funds weight matrix, normalized to sum to one."""
+    weights = np.full((len(scenarios), fund_count), 1.0 / fund_count)
+
+    for i, scenario in enumerate(scenarios):
+        if scenario.weights is None:
+            continue
+        if len(scenario.weights) != fund_count:
+            raise ValueError(f"Scenario {i + 1} needs one weight per fund")
+        row = np.asarray(scenario.weights, dtype=np.float64)
+        if (row < 0).any() or row.sum() <= 0:
+            raise ValueError(f"Scenario {i + 1} weights must be non-negative and not all zero")
+        weights[i] = row / row.sum()
+
+    return weights
+
+def build_cash_flows(grid: np.ndarray, scenarios: List[InvestmentScenario]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn scenarios into padded cash flow matrices on the date grid.
+
+    Every instalment is invested at the first NAV on or after its date.
+
+    Args:
+        grid: Date ordinals of the aligned NAV history
+        scenarios: Investment scenarios
+
+    Returns:
+        Tuple of (grid indices, amounts) of shape scenarios x instalments,
+        padded with zero amounts at the scenario's first index, and the grid
+        index of each scenario's valuation date
+    """
+    rows = []
+    end_indices = np.empty(len(scenarios), dtype=np.int64)
+
+    for i, scenario in enumerate(scenarios):
+        start = max(scenario.start_date.toordinal(), int(grid[0]))
+        end = min(scenario.end_date.toordinal(), int(grid[-1])) if scenario.end_date else int(grid[-1])
+        if start > end:
+            raise ValueError(f"Scenario {i + 1} has no NAV history between its start and end dates")
+        if scenario.sip_frequency not in SIP_FREQUENCY_MONTHS:
+            raise ValueError(f"Scenario {i + 1} sip_frequency must be one of: {', '.join(SIP_FREQUENCY_MONTHS)}")
+
+        flow_dates = []
+        flow_amounts = []
+        if scenario.lump_sum > 0:
+            flow_dates.append(start)
+            flow_amounts.append(scenario.lump_sum)
+        if scenario.sip_amount > 0:
+            sip_dates = sip_schedule(
+                date.fromordinal(start),
+                date.fromordinal(end),
+                scenario.sip_day,
+                SIP_FREQUENCY_MONTHS[scenario.sip_frequency]
+            )
+            flow_dates.extend(sip_dates)
+            flow_amounts.extend([scenario.sip_amount] * len(sip_dates))
+
+        end_indices[i] = np.searchsorted(grid, end, side="right") - 1
+        flow_indices = np.searchsorted(grid, np.asarray(flow_dates, dtype=np.int64), side="left")
+        flow_amounts = np.asarray(flow_amounts, dtype=np.float64)
+
+        # Instalments with no NAV before the valuation date are not invested
+        invested = flow_indices <= end_indices[i]
+        if not invested.any():
+            raise ValueError(f"Scenario {i + 1} invests nothing between its start and end dates")
+
+        order = np.argsort(flow_indices[invested], kind="stable")
+        rows.append((flow_indices[invested][order], flow_amounts[invested][order]))
+
+    width = max(len(flow_indices) for flow_indices, _ in rows)
+    indices = np.empty((len(rows), width), dtype=np.int64)
+    amounts = np.zeros((len(rows), width))
+    for i, (flow_indices, flow_amounts) in enumerate(rows):
+        indices[i] = flow_indices[0]
+        indices[i, :len(flow_indices)] = flow_indices
+        amounts[i, :len(flow_amounts)] = flow_amounts
+
+    return indices, amounts, end_indices
+
+def sip_schedule(start: date, end: date, sip_day: int, step_months: int) -> List[int]:
+    """Date ordinals of SIP instalments on sip_day, every step_months, from start to end."""
+    year, month = start.year, start.month
+    if start.day > sip_day:
+        month += 1
+
+    schedule = []
+    while True:
+        year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        instalment = date(year, month, sip_day)
+        if instalment > end:
+            return schedule
+        schedule.append(instalment.toordinal())
+        month += step_months
+
+def xirr(
+    amounts: np.ndarray,
+    flow_dates: np.ndarray,
+    final_values: np.ndarray,
+    end_dates: np.ndarray,
+    iterations: int = 100
+) -> np.ndarray:
+    """
+    Annualized XIRR per scenario, solved with Newton's method on all rows at once.
+
+    Args:
+        amounts: Invested amounts, scenarios x instalments
+        flow_dates: Date ordinals of the instalments
+        final_values: Portfolio value on the valuation date per scenario
+        end_dates: Valuation date ordinal per scenario
+
+    Returns:
+        Rates as fractions, NaN where no rate was found or the valuation
+        date is not after the first instalment
+    """
+    cash_flows = np.hstack([-amounts, final_values[:, None]])
+    years = np.hstack([flow_dates, end_dates[:, None]]).astype(np.float64)
+    years = (years - years[:, :1]) / 365.0
+
+    rates = np.full(len(amounts), 0.1)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(iterations):
+            discount = (1.0 + rates[:, None]) ** -years
+            npv = (cash_flows * discount).sum(axis=1)
+            slope = (-years * cash_flows * discount).sum(axis=1) / (1.0 + rates)
+            step = np.where(slope != 0, npv / slope, 0.0)
+            new_rates = np.maximum(rates - step, -0.9999)
+            converged = np.nanmax(np.abs(new_rates - rates)) < 1e-9
+            rates = new_rates
+            if converged:
+                break
+
+        npv = (cash_flows * (1.0 + rates[:, None]) ** -years).sum(axis=1)
+
+    # Only keep rates that actually zero the cash flows; with no time between
+    # the first instalment and the valuation any rate does
+    solved = np.isfinite(rates) & (np.abs(npv) <= 1e-6 * np.maximum(amounts.sum(axis=1), 1.0))
+    return np.where(solved & (amounts.sum(axis=1) > 0) & (years[:, -1] > 0), rates, np.nan)
+
+def value_curves(
+    grid: np.ndarray,
+    navs: np.ndarray,
+    weights: np.ndarray,
+    indices: np.ndarray,
+    amounts: np.ndarray,
+    end_indices: np.ndarray
+) -> List[List[ValuePoint]]:
+    """Month-end invested amount and portfolio value for each scenario."""
+    scenario_count = len(amounts)
+
+    # Dense daily cash flows, scenarios x dates
+    daily_amounts = np.zeros((scenario_count, len(grid)))
+    np.add.at(daily_amounts, (np.repeat(np.arange(scenario_count), indices.shape[1]), indices.ravel()), amounts.ravel())
+
+    # Last grid date of each month
+    dates = [date.fromordinal(int(ordinal)) for ordinal in grid]
+    month_keys = np.array([d.year * 12 + d.month for d in dates])
+    month_ends = np.append(np.flatnonzero(np.diff(month_keys)), len(grid) - 1)
+
+    rows = np.arange(scenario_count)
+    cumulative_invested = np.cumsum(daily_amounts, axis=1)
+    invested = cumulative_invested[:, month_ends]
+    end_invested = cumulative_invested[rows, end_indices]
+
+    values = np.zeros((scenario_count, len(month_ends)))
+    end_values = np.zeros(scenario_count)
+    for f in range(navs.shape[1]):
+        units = np.cumsum(daily_amounts * (weights[:, f][:, None] / navs[:, f][None, :]), axis=1)
+        values += units[:, month_ends] * navs[month_ends, f]
+        end_values += units[rows, end_indices] * navs[end_indices, f]
+
+    invested = np.round(invested, 2).tolist()
+    values = np.round(values, 2).tolist()
+    end_invested = np.round(end_invested, 2).tolist()
+    end_values = np.round(end_values, 2).tolist()
+
+    curves = []
+    for i in range(scenario_count):
+        visible = (month_ends >= indices[i, 0]) & (month_ends < end_indices[i])
+        curve = [
+            ValuePoint(date=dates[month_ends[m]], invested=invested[i][m], value=values[i][m])
+            for m in np.flatnonzero(visible)
+        ]
+
+        # Close the curve on the valuation date
+        curve.append(ValuePoint(date=dates[end_indices[i]], invested=end_invested[i], value=end_values[i]))
+        curves.append(curve)
+
+    return curves
+
+# Create simulator instance
+portfolio_simulator = PortfolioSimulator()
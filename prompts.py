@@ -53,11 +53,7 @@ FUND_COMPARISON_PROMPT = ChatPromptTemplate.from_messages([
     MessagesPlaceholder(variable_name="chat_history"),
     ("system", """Compare the following funds based on the user query:
 
-Fund 1:
-{fund_data_1}
-
-Fund 2:
-{fund_data_2}
+{fund_data}
 
 Provide a comprehensive comparison including:
 1. Performance comparison across different time periods
@@ -69,6 +65,20 @@ Provide a comprehensive comparison including:
 Be balanced and objective in your comparison.""")
 ])
 
+SIMULATION_PARAMS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    ("user", "{query}"),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("system", """The user wants to simulate an investment in these funds:
+
+{funds}
+
+Today is {today}. Extract the investment schedule from the query and return only a JSON object:
+{{"start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD or null for today", "lump_sum": 0, "sip_amount": 0, "sip_frequency": "monthly or quarterly", "weights": [one weight per fund in the order listed, or null for equal weights]}}
+
+Amounts are in rupees, so "5k" is 5000 and "1 lakh" is 100000.""")
+])
+
 FINAL_RESPONSE_PROMPT = ChatPromptTemplate.from_messages([
     ("system", SYSTEM_PROMPT),
     ("user", "{query}"),
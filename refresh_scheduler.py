@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import math
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from ..core.config import settings
+from .mfapi_service import mutual_fund_service
+
+logger = logging.getLogger(__name__)
+
+# NAVs are published on Indian business days, so the schedule runs on IST
+IST = timezone(timedelta(hours=5, minutes=30))
+
+class RefreshScheduler:
+    """
+    Background task that keeps the most requested funds warm in the cache.
+
+    Funds are ranked by how often they were requested since the last run.
+    The top funds are refreshed every settings.hot_fund_refresh_interval
+    seconds, which is shorter than the cache TTL, and once more right after
+    the daily NAV publish window so new NAVs show up without a cache miss.
+    With several workers on a shared cache backend, each fund is refreshed
+    by one worker per run.
+    """
+
+    def __init__(self, service=mutual_fund_service):
+        self.service = service
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the refresh loop."""
+        if settings.enable_cache and settings.enable_hot_fund_refresh and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def hot_funds(self) -> List[str]:
+        """
+        Get the scheme codes to refresh, most requested first.
+
+        Request counts are halved on every call so funds that stop being
+        requested drop out of the hot set over a few runs.
+
+        Returns:
+            List of scheme codes
+        """
+        counts = self.service.access_counts
+        hot = [
+            scheme_code
+            for scheme_code, count in counts.most_common(settings.hot_fund_limit)
+            if count >= settings.hot_fund_min_requests
+        ]
+
+        for scheme_code in list(counts):
+            counts[scheme_code] //= 2
+            if counts[scheme_code] == 0:
+                del counts[scheme_code]
+
+        return hot
+
+    async def refresh_hot_funds(self, run_id: str) -> int:
+        """
+        Refresh the hot funds, at most settings.refresh_concurrency at a time.
+
+        Every worker runs at the same times, so each fund is claimed for the
+        run through the shared cache and only the first worker to claim it
+        downloads it.
+
+        Args:
+            run_id: ID of the scheduled run, the same on every worker
+
+        Returns:
+            Number of funds refreshed by this worker
+        """
+        semaphore = asyncio.Semaphore(settings.refresh_concurrency)
+
+        async def refresh(scheme_code: str) -> bool:
+            # Spread requests out instead of hitting MFAPI in a burst
+            await asyncio.sleep(random.uniform(0, settings.refresh_jitter))
+            claimed = await self.service.cache.add(
+                f"refresh:{scheme_code}:{run_id}",
+                os.getpid(),
+                ttl=settings.hot_fund_refresh_interval
+            )
+            if not claimed:
+                return False
+            async with semaphore:
+                return await self.service.refresh_fund(scheme_code)
+
+        results = await asyncio.gather(*(refresh(code) for code in self.hot_funds()))
+        return sum(results)
+
+    def next_run(self, now: Optional[datetime] = None) -> Tuple[float, str]:
+        """
+        Get the delay until the next refresh and the ID of that run.
+
+        Interval runs are aligned to multiples of
+        settings.hot_fund_refresh_interval since the epoch, so all workers
+        run at the same times and agree on the run ID.
+
+        Args:
+            now: Current time, defaults to the current time in IST
+
+        Returns:
+            Tuple of (seconds until the next interval run or publish window,
+            whichever is first, and the run ID)
+        """
+        now = now or datetime.now(IST)
+        interval = settings.hot_fund_refresh_interval
+
+        publish_time = now.replace(
+            hour=settings.nav_publish_hour,
+            minute=settings.nav_publish_minute,
+            second=0,
+            microsecond=0
+        )
+        if publish_time <= now:
+            publish_time += timedelta(days=1)
+
+        slot = math.floor(now.timestamp() / interval) + 1
+        interval_delay = slot * interval - now.timestamp()
+        publish_delay = (publish_time - now).total_seconds()
+
+        if publish_delay <= interval_delay:
+            return publish_delay, f"publish:{publish_time.date().isoformat()}"
+        return interval_delay, f"interval:{slot}"
+
+    async def _run(self) -> None:
+        """Refresh hot funds until cancelled."""
+        while True:
+            delay, run_id = self.next_run()
+            await asyncio.sleep(delay)
+            try:
+                refreshed = await self.refresh_hot_funds(run_id)
+                logger.info(f"Refreshed {refreshed} hot funds")
+            except Exception as e:
+                logger.error(f"Error refreshing hot funds: {str(e)}")
+
+# Create scheduler instance
+refresh_scheduler = RefreshScheduler()
@@ -1,13 +1,67 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Union
+from datetime import date
 
 class QueryRequest(BaseModel):
     """User query request model."""
     query: str = Field(..., description="User query about mutual funds")
     max_results: Optional[int] = Field(5, description="Maximum number of results to return")
     include_historical_data: Optional[bool] = Field(False, description="Whether to include historical NAV data")
+    session_id: Optional[str] = Field(None, description="Session ID of an ongoing conversation; a new session is started if omitted")
+
+class QueryResponse(BaseModel):
+    """Agent response model."""
+    response: str = Field(..., description="Agent's response to the query")
+    session_id: str = Field(..., description="Session ID to send with follow-up queries")
 
 class ComparisonRequest(BaseModel):
     """Fund comparison request model."""
     fund_ids: List[str] = Field(..., description="List of fund scheme codes to compare")
-    comparison_period: Optional[str] = Field("1Y", description="Time period for comparison (1M, 3M, 6M, 1Y, 3Y, 5Y)")
\ No newline at end of file
+    comparison_period: Optional[str] = Field("1Y", description="Time period for comparison (1M, 3M, 6M, 1Y, 3Y, 5Y)")
+
+class InvestmentScenario(BaseModel):
+    """SIP and lump-sum schedule for a portfolio simulation."""
+    name: Optional[str] = Field(None, description="Label for the scenario")
+    weights: Optional[List[float]] = Field(None, description="Allocation per scheme code, in the same order; equal weights if omitted")
+    start_date: date = Field(..., description="Date of the lump sum and first SIP instalment")
+    end_date: Optional[date] = Field(None, description="Valuation date; latest common NAV date if omitted")
+    lump_sum: float = Field(0, ge=0, description="One-time investment on the start date")
+    sip_amount: float = Field(0, ge=0, description="Amount invested per SIP instalment")
+    sip_frequency: str = Field("monthly", description="SIP frequency (monthly, quarterly)")
+    sip_day: int = Field(1, ge=1, le=28, description="Day of the month SIP instalments are invested")
+
+class PortfolioSimulationRequest(BaseModel):
+    """Portfolio simulation request model."""
+    scheme_codes: List[str] = Field(..., description="Scheme codes of the funds in the portfolio")
+    scenarios: List[InvestmentScenario] = Field(..., description="Investment scenarios to simulate")
+    include_value_curve: bool = Field(False, description="Whether to include month-end invested and value curves")
+
+class FundHolding(BaseModel):
+    """Units held in one fund at the end of a simulation."""
+    scheme_code: str
+    invested: float
+    units: float
+    value: float
+
+class ValuePoint(BaseModel):
+    """Invested amount and portfolio value on a date."""
+    date: date
+    invested: float
+    value: float
+
+class ScenarioResult(BaseModel):
+    """Outcome of one investment scenario."""
+    name: Optional[str] = None
+    start_date: date
+    end_date: date
+    invested: float
+    final_value: float
+    absolute_return: Optional[float] = None
+    xirr: Optional[float] = None
+    holdings: List[FundHolding]
+    value_curve: Optional[List[ValuePoint]] = None
+
+class PortfolioSimulationResponse(BaseModel):
+    """Portfolio simulation response model."""
+    scheme_codes: List[str]
+    scenarios: List[ScenarioResult]
@@ -1,16 +1,32 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from typing import List, Optional
+from datetime import date
 import logging
 
 from ..schemas.fund import FundSummary, FundDetail, FundAnalysis
-from ..schemas.request import QueryRequest, ComparisonRequest
+from ..schemas.request import (
+    QueryRequest,
+    QueryResponse,
+    ComparisonRequest,
+    PortfolioSimulationRequest,
+    PortfolioSimulationResponse
+)
+from ..core.config import settings
 from ..services.mfapi_service import mutual_fund_service
+from ..services.refresh_scheduler import refresh_scheduler
+from ..services.nav_sampling import SAMPLING_METHODS, nav_points_in_range, downsample_nav
+from ..services.portfolio_simulator import portfolio_simulator
 from ..agents.fund_agent import process_query, process_query_stream
+from ..agents.session import session_store
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Keep the most requested funds warm while the app is running
+router.add_event_handler("startup", refresh_scheduler.start)
+router.add_event_handler("shutdown", refresh_scheduler.stop)
+
 @router.get("/funds/search", response_model=List[FundSummary])
 async def search_funds(
     q: str = Query(..., description="Search query for mutual funds"),
@@ -27,4 +43,123 @@ async def search_funds(
         raise HTTPException(status_code=500, detail="Failed to search funds")
 
 @router.get("/funds/{scheme_code}", response_model=FundDetail)
-async def
\ No newline at end of file
+async def get_fund_details(
+    scheme_code: str,
+    include_nav_data: bool = Query(False, description="Whether to include historical NAV data"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. scheme_name,scheme_nav"),
+    nav_from: Optional[date] = Query(None, description="First NAV date to include (YYYY-MM-DD)"),
+    nav_to: Optional[date] = Query(None, description="Last NAV date to include (YYYY-MM-DD)"),
+    sampling: Optional[str] = Query(None, description="Downsample NAV data: weekly, monthly or lttb"),
+    max_points: int = Query(100, ge=3, description="Number of NAV points to keep with lttb sampling")
+):
+    """
+    Get detailed information about a specific fund.
+    
+    NAV data is included when include_nav_data is set, any NAV option is
+    given or fields lists nav_data. Without a date range it covers the last
+    year. The response is serialized directly with orjson rather than being
+    validated again against FundDetail.
+    """
+    selected_fields = None
+    if fields:
+        selected_fields = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown_fields = selected_fields - set(FundDetail.__fields__)
+        if unknown_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown_fields))}")
+    
+    if sampling is not None and sampling not in SAMPLING_METHODS:
+        raise HTTPException(status_code=400, detail=f"sampling must be one of: {', '.join(SAMPLING_METHODS)}")
+    
+    if nav_from and nav_to and nav_from > nav_to:
+        raise HTTPException(status_code=400, detail="nav_from must not be after nav_to")
+    
+    include_nav_data = include_nav_data or bool(nav_from or nav_to or sampling)
+    if selected_fields is not None:
+        include_nav_data = "nav_data" in selected_fields
+    
+    # Fund details keep only the last year of NAVs, so date ranges read the full history
+    use_nav_history = include_nav_data and bool(nav_from or nav_to)
+    
+    try:
+        if use_nav_history:
+            # Downloading the details also caches the history, so MFAPI is called once
+            fund = await mutual_fund_service.get_fund_details(scheme_code)
+            nav_history = await mutual_fund_service.get_nav_history(scheme_code) if fund else None
+        else:
+            fund = await mutual_fund_service.get_fund_details(scheme_code, include_nav_data=include_nav_data)
+    except Exception as e:
+        logger.error(f"Error fetching fund details: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch fund details")
+    
+    if fund is None:
+        raise HTTPException(status_code=404, detail="Fund not found")
+    
+    # Cached details are shared, so NAV options build new lists instead of mutating them
+    if use_nav_history:
+        nav_data = nav_points_in_range(nav_history, nav_from, nav_to) if nav_history else []
+    else:
+        nav_data = fund.nav_data
+    if nav_data and sampling:
+        nav_data = downsample_nav(nav_data, sampling, max_points)
+    
+    content = fund.dict(include=selected_fields, exclude={"nav_data"})
+    if include_nav_data:
+        content["nav_data"] = [{"date": point.date, "nav": point.nav} for point in nav_data or []]
+    
+    return ORJSONResponse(content)
+
+@router.post("/portfolio/simulate", response_model=PortfolioSimulationResponse)
+async def simulate_portfolio(request: PortfolioSimulationRequest):
+    """
+    Simulate SIP and lump-sum investments in a portfolio of funds over their NAV history.
+    
+    Returns invested amount, final value, XIRR and units per fund for each scenario.
+    """
+    if not request.scheme_codes or len(request.scheme_codes) > settings.max_simulation_funds:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {settings.max_simulation_funds} scheme codes")
+    if not request.scenarios or len(request.scenarios) > settings.max_simulation_scenarios:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {settings.max_simulation_scenarios} scenarios")
+    
+    try:
+        return await portfolio_simulator.simulate(
+            request.scheme_codes,
+            request.scenarios,
+            include_value_curve=request.include_value_curve
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error simulating portfolio: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to simulate portfolio")
+
+@router.post("/ai/query", response_model=QueryResponse)
+async def ai_query(request: QueryRequest):
+    """
+    Answer a natural language question about mutual funds.
+    
+    Pass the returned session_id with follow-up questions to reuse the funds
+    already fetched in the conversation.
+    """
+    session_id = request.session_id or session_store.new_session_id()
+    try:
+        response = await process_query(request.query, session_id=session_id)
+        return QueryResponse(response=response, session_id=session_id)
+    except Exception as e:
+        logger.error(f"Error processing query: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process query")
+
+@router.post("/ai/query/stream")
+async def ai_query_stream(request: QueryRequest):
+    """
+    Stream the answer to a natural language question about mutual funds.
+    
+    The session ID is returned in the X-Session-ID header.
+    """
+    session_id = request.session_id or session_store.new_session_id()
+    return StreamingResponse(
+        process_query_stream(request.query, session_id=session_id),
+        media_type="text/plain",
+        headers={"X-Session-ID": session_id}
+    )
@@ -0,0 +1,115 @@
+import logging
+import time
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from langchain.schema import BaseMessage, HumanMessage, AIMessage
+
+from ..core.config import settings
+from ..core.cache import create_cache_backend
+from ..schemas.fund import FundSummary, FundDetail
+
+logger = logging.getLogger(__name__)
+
+class SessionContext(BaseModel):
+    """Fetched context kept between turns of a conversation."""
+    session_id: str
+    fund_names: List[str] = Field(default_factory=list)
+    search_results: List[FundSummary] = Field(default_factory=list)
+    fund_details: List[FundDetail] = Field(default_factory=list)
+
+    # What the fetched fund details contain
+    latest_only: bool = False
+    include_nav_data: bool = False
+
+    # Summarized (query, response) turns
+    history: List[Tuple[str, str]] = Field(default_factory=list)
+    updated_at: float = Field(default_factory=time.time)
+
+    def chat_history(self) -> List[BaseMessage]:
+        """Rebuild the chat history passed to the agent prompts."""
+        messages = []
+        for query, response in self.history:
+            messages.append(HumanMessage(content=query))
+            messages.append(AIMessage(content=response))
+        return messages
+
+class SessionStore:
+    """
+    Store for conversation sessions.
+
+    Sessions are kept in the cache backend configured in settings, so every
+    worker sees the same sessions with a shared backend. They expire after
+    settings.session_ttl seconds without a new turn, and the memory and disk
+    backends keep at most settings.max_sessions of them. Each session keeps
+    at most settings.session_max_turns turns and settings.session_max_funds
+    fund details. Cache errors only cost the conversation context: a failed
+    read is treated as no session and a failed write is ignored.
+    """
+
+    def __init__(self):
+        self.cache = create_cache_backend("sessions", max_entries=settings.max_sessions)
+
+    def new_session_id(self) -> str:
+        """Generate an ID for a new session."""
+        return uuid.uuid4().hex
+
+    async def get(self, session_id: str) -> Optional[SessionContext]:
+        """
+        Get a session if it exists and has not expired.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            SessionContext or None
+        """
+        try:
+            data = await self.cache.get(session_id)
+        except Exception as e:
+            logger.error(f"Error reading session {session_id}: {str(e)}")
+            return None
+        if data is None:
+            return None
+        return SessionContext(**data)
+
+    async def save(self, session_id: str, state: Dict[str, Any]) -> SessionContext:
+        """
+        Save the context of a finished agent run to its session.
+
+        Args:
+            session_id: Session ID
+            state: Final agent state
+
+        Returns:
+            Updated SessionContext
+        """
+        session = await self.get(session_id) or SessionContext(session_id=session_id)
+
+        # Only replace the fetched context if this turn fetched something
+        fetched_data = state.get("fetched_data")
+        if fetched_data and state.get("fund_details"):
+            session.fund_names = state.get("fund_names", [])
+            session.search_results = state.get("search_results", [])[:settings.session_max_funds]
+            session.fund_details = state["fund_details"][:settings.session_max_funds]
+            session.latest_only = fetched_data["latest_only"]
+            session.include_nav_data = fetched_data["include_nav_data"]
+
+        response = state.get("response", "")
+        session.history.append((
+            state["query"],
+            response[:settings.session_summary_chars]
+        ))
+        session.history = session.history[-settings.session_max_turns:]
+        session.updated_at = time.time()
+
+        try:
+            await self.cache.set(session_id, session.dict(), ttl=settings.session_ttl)
+        except Exception as e:
+            logger.error(f"Error saving session {session_id}: {str(e)}")
+
+        return session
+
+# Create session store instance
+session_store = SessionStore()
@@ -0,0 +1,5 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "redis: needs a Redis-compatible server at settings.redis_url")
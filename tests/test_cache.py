@@ -0,0 +1,186 @@
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+
+from app.core.cache import (
+    InMemoryCacheBackend,
+    SharedDiskCacheBackend,
+    RedisCacheBackend,
+    dumps,
+    loads
+)
+from app.core.config import settings
+from app.schemas.fund import FundSummary, FundDetail, NavDataPoint
+
+
+def make_fund_detail(nav_points: int = 3) -> FundDetail:
+    return FundDetail(
+        scheme_code="119010",
+        scheme_name="HDFC Top 100 Fund - Direct Plan - Growth",
+        fund_house="HDFC Mutual Fund",
+        scheme_nav=1000.5,
+        scheme_nav_date="02-01-2024",
+        one_year_return=12.34,
+        nav_data=[
+            NavDataPoint(date=f"{day:02d}-01-2024", nav=1000.5 - day)
+            for day in range(1, nav_points + 1)
+        ]
+    )
+
+
+@pytest.fixture
+def disk_backend(tmp_path):
+    return SharedDiskCacheBackend(str(tmp_path / "cache"))
+
+
+@pytest_asyncio.fixture(params=["memory", "disk", pytest.param("redis", marks=pytest.mark.redis)])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryCacheBackend()
+    elif request.param == "disk":
+        yield SharedDiskCacheBackend(str(tmp_path / "cache"))
+    else:
+        redis_backend = RedisCacheBackend(settings.redis_url, namespace="test")
+        try:
+            await redis_backend.client.ping()
+        except Exception:
+            pytest.skip("No Redis server running at settings.redis_url")
+        yield redis_backend
+        await redis_backend.client.aclose()
+
+
+@pytest.mark.parametrize("value", [
+    "cached LLM response",
+    [["119010", "HDFC Top 100 Fund"], ["120465", "Axis Bluechip Fund"]],
+    {"dates": b"\x01\x02", "navs": b"\x03\x04"},
+    [FundSummary(scheme_code="119010", scheme_name="HDFC Top 100 Fund")],
+    make_fund_detail(),
+    make_fund_detail(nav_points=0).copy(update={"nav_data": None}),
+])
+def test_dumps_loads_round_trip(value):
+    assert loads(dumps(value)) == value
+
+
+def test_nav_data_is_packed_as_array():
+    # NAV points are stored as a float64 array instead of one map per point
+    payload = dumps(make_fund_detail(nav_points=28))
+    assert len(payload) < len(dumps(make_fund_detail(nav_points=28).dict()))
+
+
+@pytest.mark.asyncio
+async def test_backend_round_trip(backend):
+    fund_detail = make_fund_detail()
+    await backend.set("fund:119010:True", fund_detail)
+    await backend.set("search:hdfc:10", [FundSummary(scheme_code="119010", scheme_name="HDFC Top 100 Fund")])
+
+    assert await backend.get("fund:119010:True") == fund_detail
+    assert (await backend.get("search:hdfc:10"))[0].scheme_code == "119010"
+    assert await backend.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_delete(backend):
+    await backend.set("key", "value")
+    await backend.delete("key")
+    assert await backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_zero_ttl_expires_immediately(backend):
+    await backend.set("key", "value", ttl=0)
+    assert await backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_ttl_expiry(backend):
+    await backend.set("short", "value", ttl=1)
+    await backend.set("long", "value", ttl=60)
+    assert await backend.get("short") == "value"
+
+    await asyncio.sleep(1.1)
+
+    assert await backend.get("short") is None
+    assert await backend.get("long") == "value"
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_concurrent_writes(disk_backend):
+    for _ in range(20):
+        await asyncio.gather(*(disk_backend.set("key", f"value {i}") for i in range(8)))
+        assert (await disk_backend.get("key")).startswith("value ")
+
+    # No temporary files are left behind
+    assert len(os.listdir(disk_backend.directory)) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_sweep_removes_expired_entries(disk_backend):
+    await disk_backend.set("expired", "value", ttl=0)
+    await disk_backend.set("fresh", "value", ttl=60)
+
+    disk_backend.sweep()
+
+    assert len(os.listdir(disk_backend.directory)) == 1
+    assert await disk_backend.get("fresh") == "value"
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_sweep_caps_entries(tmp_path):
+    backend = SharedDiskCacheBackend(str(tmp_path / "cache"), max_entries=5)
+    for i in range(12):
+        await backend.set(f"key {i}", i)
+        # Distinct modification times so the oldest entries are removed first
+        os.utime(backend._path(f"key {i}"), (i, i))
+
+    backend.sweep()
+
+    assert len(os.listdir(backend.directory)) == 5
+    assert await backend.get("key 11") == 11
+    assert await backend.get("key 0") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_add_only_stores_missing_keys(backend):
+    assert await backend.add("lock", 1, ttl=60)
+    assert not await backend.add("lock", 2, ttl=60)
+    assert await backend.get("lock") == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_add_takes_over_expired_keys(backend):
+    await backend.set("lock", 1, ttl=0)
+    assert await backend.add("lock", 2, ttl=60)
+    assert await backend.get("lock") == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_concurrent_add_has_one_winner(tmp_path):
+    # Two workers sharing one directory
+    workers = [SharedDiskCacheBackend(str(tmp_path / "cache")) for _ in range(2)]
+    results = await asyncio.gather(*(
+        worker.add("lock", i, ttl=60) for i in range(8) for worker in workers
+    ))
+    assert results.count(True) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_concurrent_takeover_has_one_winner(tmp_path):
+    workers = [SharedDiskCacheBackend(str(tmp_path / "cache")) for _ in range(2)]
+    for run in range(20):
+        await workers[0].set(f"lock {run}", "stale", ttl=0)
+        results = await asyncio.gather(*(
+            worker.add(f"lock {run}", i, ttl=60) for i in range(8) for worker in workers
+        ))
+        assert results.count(True) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_caps_entries():
+    backend = InMemoryCacheBackend(max_entries=2)
+    for i in range(3):
+        await backend.set(f"key {i}", i)
+
+    assert await backend.get("key 0") is None
+    assert await backend.get("key 2") == 2
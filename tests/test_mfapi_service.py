@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.core.cache import InMemoryCacheBackend
+from app.services import mfapi_service
+from app.services.mfapi_service import MutualFundService
+
+FIRST_NAV_DATE = date(2019, 1, 1)
+NAV_DAYS = 2000
+
+
+def scheme_response():
+    rows = [
+        {"date": (FIRST_NAV_DATE + timedelta(days=i)).strftime("%d-%m-%Y"), "nav": f"{10 + i / 100:.4f}"}
+        for i in range(NAV_DAYS)
+    ]
+    return {
+        "meta": {"scheme_name": "HDFC Top 100 Fund", "fund_house": "HDFC Mutual Fund"},
+        "data": rows[::-1],
+        "status": "SUCCESS"
+    }
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Serve MFAPI from memory, recording the requested paths."""
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, json=scheme_response())
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        mfapi_service.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return paths
+
+
+@pytest.fixture
+def service():
+    service = MutualFundService()
+    service.cache = InMemoryCacheBackend()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_fund_details_download_fills_nav_history(service, requests):
+    fund = await service.get_fund_details("119010", include_nav_data=True)
+    dates, navs = await service.get_nav_history("119010")
+
+    assert len(requests) == 1
+    assert len(fund.nav_data) == 365
+    assert len(dates) == NAV_DAYS
+    assert dates[0] == FIRST_NAV_DATE.toordinal() and navs[0] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_fund_overwrites_every_entry(service, requests):
+    assert await service.refresh_fund("119010")
+
+    assert await service.get_fund_details("119010") is not None
+    assert await service.get_fund_details("119010", include_nav_data=True) is not None
+    assert await service.get_latest_nav("119010") is not None
+    assert await service.get_nav_history("119010") is not None
+    assert len(requests) == 1
@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.schemas.fund import NavDataPoint
+from app.services.nav_sampling import (
+    NAV_DATE_FORMAT,
+    downsample_nav,
+    nav_points_in_range,
+    parse_nav_date
+)
+
+
+def daily_points(start: date, days: int):
+    """NAV points for consecutive days, most recent first as returned by MFAPI."""
+    points = [
+        NavDataPoint(date=(start + timedelta(days=i)).strftime(NAV_DATE_FORMAT), nav=10.0 + i)
+        for i in range(days)
+    ]
+    return points[::-1]
+
+
+def dates_of(points):
+    return [parse_nav_date(point.date) for point in points]
+
+
+def test_weekly_keeps_last_point_of_each_iso_week():
+    # Wednesday 27-12-2023 to Tuesday 09-01-2024, across the year boundary
+    sampled = downsample_nav(daily_points(date(2023, 12, 27), 14), "weekly")
+
+    assert dates_of(sampled) == [date(2024, 1, 9), date(2024, 1, 7), date(2023, 12, 31)]
+
+
+def test_monthly_keeps_last_point_of_each_month():
+    sampled = downsample_nav(daily_points(date(2024, 1, 30), 32), "monthly")
+
+    assert dates_of(sampled) == [date(2024, 3, 1), date(2024, 2, 29), date(2024, 1, 31)]
+
+
+def test_lttb_point_count_and_endpoints():
+    points = daily_points(date(2023, 1, 1), 365)
+
+    sampled = downsample_nav(points, "lttb", max_points=50)
+
+    assert len(sampled) == 50
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert dates_of(sampled) == sorted(dates_of(sampled), reverse=True)
+
+
+def test_lttb_keeps_short_series():
+    points = daily_points(date(2024, 1, 1), 10)
+
+    assert downsample_nav(points, "lttb", max_points=50) == points
+
+
+def test_unknown_sampling_method():
+    with pytest.raises(ValueError):
+        downsample_nav(daily_points(date(2024, 1, 1), 3), "hourly")
+
+
+def test_nav_points_in_range_is_inclusive():
+    dates = np.array([date(2024, 1, day).toordinal() for day in (1, 2, 3, 5, 8)], dtype=np.int64)
+    navs = np.array([10.0, 11.0, 12.0, 13.0, 14.0])
+
+    points = nav_points_in_range((dates, navs), date(2024, 1, 2), date(2024, 1, 5))
+
+    assert points == [
+        NavDataPoint(date="05-01-2024", nav=13.0),
+        NavDataPoint(date="03-01-2024", nav=12.0),
+        NavDataPoint(date="02-01-2024", nav=11.0),
+    ]
+    assert len(nav_points_in_range((dates, navs), end=date(2024, 1, 4))) == 3
+    assert len(nav_points_in_range((dates, navs), start=date(2024, 1, 4))) == 2
+    assert nav_points_in_range((dates, navs), date(2024, 1, 6), date(2024, 1, 7)) == []
@@ -0,0 +1,226 @@
+import pytest
+
+from app.agents import nodes
+from app.agents.nodes import (
+    INTENT_NAV,
+    INTENT_RETURNS,
+    INTENT_HISTORY,
+    INTENT_COMPARISON,
+    INTENT_SIMULATION,
+    analyze_funds,
+    classify_intent,
+    context_covers_query,
+    reuse_session_context,
+    route_after_analysis,
+    route_after_search,
+    route_after_reuse,
+    route_to_final_response,
+    select_funds
+)
+from app.agents.session import SessionContext
+from app.schemas.fund import FundSummary, FundDetail
+
+
+def make_fund(scheme_code: str, scheme_name: str) -> FundSummary:
+    return FundSummary(scheme_code=scheme_code, scheme_name=scheme_name)
+
+
+HDFC_TOP_100_DIRECT = make_fund("119018", "HDFC Top 100 Fund - Direct Plan - Growth Option")
+HDFC_TOP_100_REGULAR = make_fund("102000", "HDFC Top 100 Fund - Growth Option - Regular Plan")
+HDFC_BALANCED_ADVANTAGE = make_fund("118968", "HDFC Balanced Advantage Fund - Direct Plan - Growth")
+SBI_EQUITY_HYBRID = make_fund("119609", "SBI Equity Hybrid Fund - Direct Plan - Growth")
+SBI_EQUITY_HYBRID_IDCW = make_fund("119610", "SBI Equity Hybrid Fund - Direct Plan - IDCW")
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("What is the NAV of HDFC Top 100?", INTENT_NAV),
+    ("what is the nav of Invesco India Growth Opportunities Fund", INTENT_NAV),
+    ("latest NAV of Mirae Asset Emerging Bluechip Fund - Direct Plan - Growth", INTENT_NAV),
+    ("What is the NAV of hdfc balanced advantage and sbi equity hybrid", INTENT_NAV),
+    ("What are the returns of Axis Bluechip?", INTENT_RETURNS),
+    ("What is the 5 year CAGR of Parag Parikh Flexi Cap?", INTENT_RETURNS),
+    ("NAV and 3-year return of SBI Small Cap", INTENT_RETURNS),
+    ("How has Invesco India Growth Opportunities performed?", INTENT_RETURNS),
+    ("Tell me about Kotak Emerging Equity", INTENT_RETURNS),
+    ("Show the NAV history of Quant Small Cap", INTENT_HISTORY),
+    ("How volatile is Nippon India Growth Fund?", INTENT_HISTORY),
+    ("Compare SBI Bluechip with ICICI Bluechip fund", INTENT_COMPARISON),
+    ("HDFC Top 100 vs Axis Bluechip returns", INTENT_COMPARISON),
+    ("Which is better, Mirae Large Cap or Canara Robeco Bluechip?", INTENT_COMPARISON),
+    ("What if I had put 10k in HDFC Top 100 in 2020?", INTENT_SIMULATION),
+    ("A monthly SIP of 5000 in Axis Midcap since 2018", INTENT_SIMULATION),
+    ("What if the fund manager of HDFC Top 100 changes?", INTENT_RETURNS),
+])
+def test_classify_intent(query, intent):
+    assert classify_intent(query) == intent
+
+
+@pytest.mark.parametrize("fund_names, search_results, expected", [
+    # One name picks one plan, not every plan of the fund
+    (["HDFC Top 100"], [HDFC_TOP_100_DIRECT, HDFC_TOP_100_REGULAR], [HDFC_TOP_100_DIRECT]),
+    # Analysis lines that are not fund names don't add funds
+    (
+        ["HDFC Top 100", "SIP returns of the fund"],
+        [HDFC_TOP_100_DIRECT, HDFC_TOP_100_REGULAR],
+        [HDFC_TOP_100_DIRECT]
+    ),
+    # Nor does the fund house of a fund already picked
+    (["HDFC", "HDFC Top 100"], [HDFC_TOP_100_DIRECT, HDFC_TOP_100_REGULAR], [HDFC_TOP_100_DIRECT]),
+    # Every matching name gets its fund
+    (
+        ["hdfc balanced advantage", "sbi equity hybrid"],
+        [HDFC_BALANCED_ADVANTAGE, SBI_EQUITY_HYBRID, SBI_EQUITY_HYBRID_IDCW],
+        [HDFC_BALANCED_ADVANTAGE, SBI_EQUITY_HYBRID]
+    ),
+    # Without a matching name the top result is used
+    ([], [HDFC_TOP_100_DIRECT, HDFC_TOP_100_REGULAR], [HDFC_TOP_100_DIRECT]),
+    ([], [], []),
+])
+def test_select_funds(fund_names, search_results, expected):
+    state = {"fund_names": fund_names, "search_results": search_results}
+
+    assert select_funds(state, max_funds=5) == expected
+
+
+def test_select_funds_fills_comparisons_and_caps():
+    state = {
+        "fund_names": ["hdfc balanced advantage", "sbi equity hybrid"],
+        "search_results": [HDFC_BALANCED_ADVANTAGE, SBI_EQUITY_HYBRID]
+    }
+    assert select_funds(state, max_funds=1) == [HDFC_BALANCED_ADVANTAGE]
+
+    state = {"fund_names": ["Bluechip funds"], "search_results": [HDFC_TOP_100_DIRECT, SBI_EQUITY_HYBRID]}
+    assert select_funds(state, max_funds=5, min_funds=2) == [HDFC_TOP_100_DIRECT, SBI_EQUITY_HYBRID]
+
+
+@pytest.mark.parametrize("intent, node", [
+    (INTENT_NAV, "fetch_latest_nav"),
+    (INTENT_SIMULATION, "simulate_portfolio"),
+    (INTENT_RETURNS, "fetch_fund_details"),
+    (INTENT_HISTORY, "fetch_fund_details"),
+    (INTENT_COMPARISON, "fetch_fund_details"),
+])
+def test_route_after_search(intent, node):
+    assert route_after_search({"intent": intent}) == node
+
+
+@pytest.mark.parametrize("intent, node", [
+    (INTENT_NAV, "generate_final_response"),
+    (INTENT_SIMULATION, "simulate_portfolio"),
+    (INTENT_RETURNS, "analyze_funds"),
+    (INTENT_COMPARISON, "analyze_funds"),
+])
+def test_route_after_reuse(intent, node):
+    assert route_after_reuse({"intent": intent}) == node
+
+
+def test_route_after_analysis_without_session_searches():
+    state = {"query": "And how did they do over 5 years?", "session": None, "intent": INTENT_RETURNS}
+
+    assert route_after_analysis(state) == "search_funds"
+
+
+def test_route_to_final_response():
+    assert route_to_final_response({"response": "I couldn't find any mutual funds."}) == "end"
+    assert route_to_final_response({"fund_analysis": "..."}) == "generate_final_response"
+
+
+def make_session(fund_details, latest_only=False, include_nav_data=False):
+    return SessionContext(
+        session_id="abc",
+        fund_names=[fund.scheme_name for fund in fund_details],
+        search_results=[FundSummary(scheme_code=fund.scheme_code, scheme_name=fund.scheme_name) for fund in fund_details],
+        fund_details=fund_details,
+        latest_only=latest_only,
+        include_nav_data=include_nav_data
+    )
+
+
+SBI_BLUECHIP_DETAIL = FundDetail(scheme_code="119598", scheme_name="SBI Bluechip Fund - Direct Plan - Growth", five_year_return=98.1)
+ICICI_BLUECHIP_DETAIL = FundDetail(scheme_code="120586", scheme_name="ICICI Prudential Bluechip Fund - Direct Plan - Growth", five_year_return=110.4)
+
+
+@pytest.mark.parametrize("query, fund_names, session_kwargs, covered", [
+    ("And how did they do over 5 years?", [], {}, True),
+    # Not a follow-up
+    ("How did HDFC Top 100 do over 5 years?", [], {}, False),
+    # A fund that wasn't fetched
+    ("And how does it compare with HDFC Top 100?", ["HDFC Top 100"], {}, False),
+    ("What are their 1 year returns?", ["SBI Bluechip"], {}, True),
+    # Latest-NAV sessions have no returns
+    ("And how did they do over 5 years?", [], {"latest_only": True}, False),
+    ("What is their NAV?", [], {"latest_only": True}, True),
+    # History needs the NAV data
+    ("Show their NAV history", [], {}, False),
+    ("Show their NAV history", [], {"include_nav_data": True}, True),
+])
+def test_context_covers_query(query, fund_names, session_kwargs, covered):
+    state = {
+        "query": query,
+        "fund_names": fund_names,
+        "intent": classify_intent(query),
+        "session": make_session([SBI_BLUECHIP_DETAIL, ICICI_BLUECHIP_DETAIL], **session_kwargs)
+    }
+
+    assert context_covers_query(state) == covered
+
+
+def test_comparison_follow_up_needs_two_funds():
+    state = {
+        "query": "Which of these is better than Axis Bluechip?",
+        "intent": INTENT_COMPARISON,
+        "session": make_session([SBI_BLUECHIP_DETAIL])
+    }
+
+    assert not context_covers_query(state)
+
+
+@pytest.mark.asyncio
+async def test_follow_up_after_comparison_compares_every_fund(monkeypatch):
+    # The follow-up flow from the README
+    prompts = []
+
+    async def fake_generate_response(messages, temperature=0.1):
+        prompts.append(messages[-1].content)
+        return "analysis"
+
+    monkeypatch.setattr(nodes, "generate_response", fake_generate_response)
+
+    query = "And how did they do over 5 years?"
+    state = {
+        "query": query,
+        "fund_names": [],
+        "intent": classify_intent(query),
+        "session": make_session([SBI_BLUECHIP_DETAIL, ICICI_BLUECHIP_DETAIL])
+    }
+    assert route_after_analysis(state) == "reuse_session_context"
+
+    state = await reuse_session_context(state)
+    assert state["fund_details"] == [SBI_BLUECHIP_DETAIL, ICICI_BLUECHIP_DETAIL]
+    assert route_after_reuse(state) == "analyze_funds"
+
+    await analyze_funds(state)
+    assert "SBI Bluechip Fund" in prompts[0] and "ICICI Prudential Bluechip Fund" in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_single_fund_sip_simulates_one_plan(monkeypatch):
+    simulated = []
+
+    async def fake_generate_response(messages, temperature=0.1):
+        return '{"start_date": "2020-01-01", "sip_amount": 5000}'
+
+    async def fake_simulate(scheme_codes, scenarios, include_value_curve=False):
+        simulated.append(scheme_codes)
+        raise LookupError("no history in this test")
+
+    monkeypatch.setattr(nodes, "generate_response", fake_generate_response)
+    monkeypatch.setattr(nodes.portfolio_simulator, "simulate", fake_simulate)
+
+    await nodes.simulate_portfolio({
+        "query": "What if I had a 5k SIP in HDFC Top 100 since 2020?",
+        "fund_names": ["HDFC Top 100", "Information sought: SIP returns of the fund"],
+        "search_results": [HDFC_TOP_100_DIRECT, HDFC_TOP_100_REGULAR]
+    })
+
+    assert simulated == [[HDFC_TOP_100_DIRECT.scheme_code]]
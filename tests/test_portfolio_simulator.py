@@ -0,0 +1,100 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.schemas.request import InvestmentScenario
+from app.services.portfolio_simulator import PortfolioSimulator
+
+FIRST_NAV_DATE = date(2020, 1, 1)
+LAST_NAV_DATE = date(2024, 12, 31)
+
+
+class FakeFundService:
+    """Serves synthetic NAV histories instead of calling MFAPI."""
+
+    def __init__(self, histories):
+        self.histories = histories
+
+    async def get_nav_history(self, scheme_code):
+        return self.histories.get(scheme_code)
+
+
+def constant_growth(annual_rate, start_nav=10.0):
+    """Daily NAVs growing at a constant annual rate."""
+    dates = np.arange(FIRST_NAV_DATE.toordinal(), LAST_NAV_DATE.toordinal() + 1, dtype=np.int64)
+    navs = start_nav * (1 + annual_rate) ** ((dates - dates[0]) / 365.0)
+    return dates, navs
+
+
+@pytest.fixture
+def simulator():
+    return PortfolioSimulator(FakeFundService({
+        "119010": constant_growth(0.12),
+        "120465": constant_growth(0.08, start_nav=25.0),
+    }))
+
+
+@pytest.mark.asyncio
+async def test_xirr_matches_constant_growth(simulator):
+    scenarios = [
+        InvestmentScenario(name="lump sum", start_date=date(2021, 3, 15), lump_sum=100000),
+        InvestmentScenario(name="sip", start_date=date(2020, 6, 1), sip_amount=5000, sip_day=10),
+    ]
+
+    result = await simulator.simulate(["119010"], scenarios)
+
+    assert [scenario.xirr for scenario in result.scenarios] == [12.0, 12.0]
+
+
+@pytest.mark.asyncio
+async def test_lump_sum_only(simulator):
+    scenario = InvestmentScenario(
+        start_date=date(2022, 1, 1),
+        end_date=date(2023, 1, 1),
+        lump_sum=50000,
+        weights=[3, 1]
+    )
+
+    result = (await simulator.simulate(["119010", "120465"], [scenario])).scenarios[0]
+
+    assert result.invested == 50000
+    assert [holding.invested for holding in result.holdings] == [37500, 12500]
+    assert result.final_value == pytest.approx(37500 * 1.12 + 12500 * 1.08, abs=0.05)
+    assert result.absolute_return == pytest.approx(11.0, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_start_before_history_uses_first_nav(simulator):
+    scenario = InvestmentScenario(start_date=date(2015, 1, 1), end_date=date(2021, 1, 1), lump_sum=1000)
+
+    result = (await simulator.simulate(["119010"], [scenario])).scenarios[0]
+
+    assert result.start_date == FIRST_NAV_DATE
+    assert result.holdings[0].units == 100
+
+
+@pytest.mark.asyncio
+async def test_end_before_start_is_rejected(simulator):
+    scenario = InvestmentScenario(start_date=date(2023, 1, 1), end_date=date(2022, 1, 1), lump_sum=1000)
+
+    with pytest.raises(ValueError):
+        await simulator.simulate(["119010"], [scenario])
+
+
+@pytest.mark.asyncio
+async def test_no_xirr_without_time_to_grow(simulator):
+    scenario = InvestmentScenario(start_date=date(2023, 1, 2), end_date=date(2023, 1, 2), lump_sum=1000)
+
+    result = (await simulator.simulate(["119010"], [scenario])).scenarios[0]
+
+    assert result.final_value == 1000
+    assert result.xirr is None
+
+
+@pytest.mark.asyncio
+async def test_missing_history_is_reported(simulator):
+    scenario = InvestmentScenario(start_date=date(2022, 1, 1), lump_sum=1000)
+
+    with pytest.raises(LookupError, match="100001"):
+        await simulator.simulate(["119010", "100001"], [scenario])
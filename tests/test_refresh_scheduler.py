@@ -0,0 +1,79 @@
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import InMemoryCacheBackend
+from app.core.config import settings
+from app.services.refresh_scheduler import RefreshScheduler, IST
+
+
+class FakeFundService:
+    """Records refreshes instead of calling MFAPI."""
+
+    def __init__(self, cache, refreshed):
+        self.cache = cache
+        self.access_counts = Counter()
+        self.refreshed = refreshed
+
+    async def refresh_fund(self, scheme_code):
+        self.refreshed.append(scheme_code)
+        return True
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(settings, "refresh_jitter", 0)
+
+
+@pytest.mark.asyncio
+async def test_refreshes_only_hot_funds():
+    refreshed = []
+    service = FakeFundService(InMemoryCacheBackend(), refreshed)
+    service.access_counts.update({"119010": 10, "120465": settings.hot_fund_min_requests, "100001": 1})
+
+    assert await RefreshScheduler(service).refresh_hot_funds("interval:1") == 2
+    assert sorted(refreshed) == ["119010", "120465"]
+    # Counts decay so funds that go cold drop out
+    assert service.access_counts["119010"] == 5
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_cache_refresh_each_fund_once():
+    cache = InMemoryCacheBackend()
+    refreshed = []
+    workers = []
+    for _ in range(3):
+        service = FakeFundService(cache, refreshed)
+        service.access_counts.update({"119010": 10, "120465": 10})
+        workers.append(RefreshScheduler(service))
+
+    for worker in workers:
+        await worker.refresh_hot_funds("interval:1")
+    assert sorted(refreshed) == ["119010", "120465"]
+
+    # The next run refreshes them again
+    for worker in workers:
+        worker.service.access_counts.update({"119010": 10})
+        await worker.refresh_hot_funds("interval:2")
+    assert refreshed.count("119010") == 2
+
+
+def test_next_run_is_aligned_across_workers(monkeypatch):
+    monkeypatch.setattr(settings, "hot_fund_refresh_interval", 2700)
+    now = datetime(2026, 1, 5, 10, 0, 7, tzinfo=IST)
+
+    delay, run_id = RefreshScheduler().next_run(now)
+
+    assert (now.timestamp() + delay) % 2700 == 0
+    assert run_id == f"interval:{int((now.timestamp() + delay) // 2700)}"
+
+
+def test_next_run_after_publish_window(monkeypatch):
+    monkeypatch.setattr(settings, "hot_fund_refresh_interval", 2700)
+    now = datetime(2026, 1, 5, 23, 29, 0, tzinfo=IST)
+
+    delay, run_id = RefreshScheduler().next_run(now)
+
+    assert delay == 60
+    assert run_id == "publish:2026-01-05"
@@ -0,0 +1,111 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import router
+from app.schemas.fund import FundDetail, NavDataPoint
+from app.services.mfapi_service import mutual_fund_service
+
+# Full history from 2019, of which fund details keep the last year
+HISTORY_DATES = np.arange(date(2019, 1, 1).toordinal(), date(2024, 12, 31).toordinal() + 1, dtype=np.int64)
+HISTORY_NAVS = np.linspace(10.0, 40.0, len(HISTORY_DATES))
+
+
+class FakeFundService:
+    """Serves one fund instead of calling MFAPI, recording the calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_fund_details(self, scheme_code, include_nav_data=False):
+        self.calls.append(("get_fund_details", include_nav_data))
+        if scheme_code != "119010":
+            return None
+        fund = FundDetail(scheme_code=scheme_code, scheme_name="HDFC Top 100 Fund", scheme_nav=40.0)
+        if include_nav_data:
+            fund.nav_data = [
+                NavDataPoint(date=date.fromordinal(int(ordinal)).strftime("%d-%m-%Y"), nav=float(nav))
+                for ordinal, nav in zip(HISTORY_DATES[::-1][:365], HISTORY_NAVS[::-1][:365])
+            ]
+        return fund
+
+    async def get_nav_history(self, scheme_code):
+        self.calls.append(("get_nav_history",))
+        return HISTORY_DATES, HISTORY_NAVS
+
+
+@pytest.fixture
+def service(monkeypatch):
+    fake = FakeFundService()
+    monkeypatch.setattr(mutual_fund_service, "get_fund_details", fake.get_fund_details)
+    monkeypatch.setattr(mutual_fund_service, "get_nav_history", fake.get_nav_history)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def test_fund_details_without_nav_data(client, service):
+    body = client.get("/api/funds/119010").json()
+
+    assert body["scheme_name"] == "HDFC Top 100 Fund"
+    assert "nav_data" not in body
+    assert service.calls == [("get_fund_details", False)]
+
+
+def test_fields_select_nav_data(client, service):
+    body = client.get("/api/funds/119010", params={"fields": "scheme_name,nav_data"}).json()
+
+    assert set(body) == {"scheme_name", "nav_data"}
+    assert len(body["nav_data"]) == 365
+
+
+def test_fields_without_nav_data_skip_nav_options(client, service):
+    body = client.get("/api/funds/119010", params={"fields": "scheme_nav", "sampling": "weekly"}).json()
+
+    assert body == {"scheme_nav": 40.0}
+    assert service.calls == [("get_fund_details", False)]
+
+
+def test_date_range_reads_full_history(client, service):
+    params = {"nav_from": "2020-01-01", "nav_to": "2020-01-31"}
+    body = client.get("/api/funds/119010", params=params).json()
+
+    dates = [point["date"] for point in body["nav_data"]]
+    assert len(dates) == 31
+    assert dates[0] == "31-01-2020" and dates[-1] == "01-01-2020"
+    assert ("get_nav_history",) in service.calls
+
+
+def test_date_range_with_sampling(client, service):
+    params = {"nav_from": "2020-01-01", "nav_to": "2020-12-31", "sampling": "monthly"}
+    body = client.get("/api/funds/119010", params=params).json()
+
+    assert len(body["nav_data"]) == 12
+    assert body["nav_data"][0]["date"] == "31-12-2020"
+
+
+def test_lttb_sampling(client, service):
+    body = client.get("/api/funds/119010", params={"sampling": "lttb", "max_points": 20}).json()
+
+    assert len(body["nav_data"]) == 20
+
+
+@pytest.mark.parametrize("params", [
+    {"fields": "scheme_name,unknown"},
+    {"sampling": "hourly"},
+    {"nav_from": "2021-01-01", "nav_to": "2020-01-01"},
+])
+def test_invalid_options(client, service, params):
+    assert client.get("/api/funds/119010", params=params).status_code == 400
+
+
+def test_unknown_fund(client, service):
+    assert client.get("/api/funds/999999").status_code == 404
@@ -0,0 +1,100 @@
+import pytest
+
+from app.agents.nodes import INTENT_DATA_REQUIREMENTS, INTENT_NAV, INTENT_RETURNS
+from app.agents.session import SessionStore
+from app.core.cache import InMemoryCacheBackend
+from app.core.config import settings
+from app.schemas.fund import FundSummary, FundDetail
+
+
+class FailingCacheBackend(InMemoryCacheBackend):
+    """Cache backend whose server is down."""
+
+    async def get(self, key):
+        raise ConnectionError("cache unavailable")
+
+    async def set(self, key, value, ttl=None):
+        raise ConnectionError("cache unavailable")
+
+
+def make_funds(count: int):
+    summaries = [FundSummary(scheme_code=str(100000 + i), scheme_name=f"Fund {i}") for i in range(count)]
+    details = [FundDetail(scheme_code=fund.scheme_code, scheme_name=fund.scheme_name) for fund in summaries]
+    return summaries, details
+
+
+def make_state(query: str, funds: int = 0, intent: str = INTENT_RETURNS, response: str = "Answer"):
+    summaries, details = make_funds(funds)
+    state = {"query": query, "response": response}
+    if funds:
+        state.update({
+            "fund_names": [fund.scheme_name for fund in summaries],
+            "search_results": summaries,
+            "fund_details": details,
+            "fetched_data": INTENT_DATA_REQUIREMENTS[intent]
+        })
+    return state
+
+
+@pytest.fixture
+def store():
+    store = SessionStore()
+    store.cache = InMemoryCacheBackend()
+    return store
+
+
+@pytest.mark.asyncio
+async def test_new_session_is_saved(store):
+    await store.save("abc", make_state("NAV of Fund 0", funds=1, intent=INTENT_NAV))
+
+    session = await store.get("abc")
+    assert [fund.scheme_code for fund in session.fund_details] == ["100000"]
+    assert session.latest_only and not session.include_nav_data
+    assert session.history == [("NAV of Fund 0", "Answer")]
+
+
+@pytest.mark.asyncio
+async def test_turn_without_fetch_keeps_context(store):
+    await store.save("abc", make_state("Compare Fund 0 and Fund 1", funds=2))
+    # A follow-up answered from the session fetches nothing
+    await store.save("abc", make_state("And over 5 years?"))
+
+    session = await store.get("abc")
+    assert len(session.fund_details) == 2
+    assert not session.latest_only
+    assert len(session.history) == 2
+
+
+@pytest.mark.asyncio
+async def test_turn_with_fetch_replaces_context(store):
+    await store.save("abc", make_state("Compare Fund 0 and Fund 1", funds=2))
+    await store.save("abc", make_state("NAV of Fund 0", funds=1, intent=INTENT_NAV))
+
+    session = await store.get("abc")
+    assert len(session.fund_details) == 1
+    assert session.latest_only
+
+
+@pytest.mark.asyncio
+async def test_session_caps(store, monkeypatch):
+    monkeypatch.setattr(settings, "session_max_turns", 2)
+    monkeypatch.setattr(settings, "session_max_funds", 3)
+    monkeypatch.setattr(settings, "session_summary_chars", 10)
+
+    for turn in range(4):
+        await store.save("abc", make_state(f"Query {turn}", funds=5, response="x" * 50))
+
+    session = await store.get("abc")
+    assert [query for query, _ in session.history] == ["Query 2", "Query 3"]
+    assert all(len(response) == 10 for _, response in session.history)
+    assert len(session.fund_details) == 3
+    assert len(session.search_results) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_do_not_fail_the_turn(store):
+    store.cache = FailingCacheBackend()
+
+    assert await store.get("abc") is None
+    session = await store.save("abc", make_state("NAV of Fund 0", funds=1, intent=INTENT_NAV))
+    assert session.history == [("NAV of Fund 0", "Answer")]